@@ -54,9 +54,25 @@ def migration():
     "--keep-logs",
     is_flag=True,
 )
+@click.option(
+    "--offline-snapshot",
+    help="Path to a lookups snapshot, to dry run without db or search access.",
+)
+@click.option(
+    "--result-cache",
+    help="Directory of the transform results cache, for offline dry runs.",
+)
 @with_appcontext
-def run(collection, dry_run=False, keep_logs=False):
+def run(
+    collection, dry_run=False, keep_logs=False, offline_snapshot=None, result_cache=None
+):
     """Run."""
+    if offline_snapshot and not dry_run:
+        raise click.UsageError("--offline-snapshot can only be used with --dry-run.")
+    if result_cache and not offline_snapshot:
+        raise click.UsageError(
+            "--result-cache can only be used with --offline-snapshot."
+        )
     stream_config = current_app.config["CDS_MIGRATOR_KIT_STREAM_CONFIG"]
     runner = Runner(
         stream_definitions=[RecordStreamDefinition],
@@ -65,10 +81,83 @@ def run(collection, dry_run=False, keep_logs=False):
         dry_run=dry_run,
         collection=collection,
         keep_logs=keep_logs,
+        offline_snapshot=offline_snapshot,
+        result_cache=result_cache,
     )
     runner.run()
 
 
+@migration.group()
+def snapshot():
+    """Migration CLI for the lookups snapshots."""
+    pass
+
+
+@snapshot.command()
+@click.option(
+    "--filepath",
+    help="Path to the snapshot file to create.",
+    required=True,
+)
+@with_appcontext
+def export(filepath):
+    """Export the lookups of the records transform to a snapshot file."""
+    from cds_migrator_kit.rdm.records.snapshot import export_snapshot
+
+    export_snapshot(filepath)
+    click.secho(f"Lookups snapshot exported to {filepath}.", fg="green")
+
+
+@migration.group()
+def dois():
+    """Migration CLI for the queued DOIs updates."""
+    pass
+
+
+@dois.command()
+@click.option(
+    "--filepath",
+    help="Path to the DOIs queue file, the `dois_queue` of the load.",
+    required=True,
+)
+@click.option(
+    "--workers",
+    default=4,
+    type=int,
+    help="Number of records published in parallel.",
+)
+@click.option(
+    "--batch-size",
+    default=100,
+    type=int,
+    help="Number of records fetched from the queue at once.",
+)
+@click.option(
+    "--rate-limit",
+    type=float,
+    help="Maximum number of records published per second.",
+)
+@click.option(
+    "--retry-failed",
+    is_flag=True,
+    help="Queue again the records that failed in a previous flush.",
+)
+@with_appcontext
+def flush(filepath, workers, batch_size, rate_limit=None, retry_failed=False):
+    """Edit and publish again the queued records to update their DOIs."""
+    from cds_migrator_kit.rdm.records.load.dois import DOIsQueue, flush_dois_queue
+
+    if retry_failed:
+        DOIsQueue(filepath).reset_failed()
+    processed, failed = flush_dois_queue(
+        filepath, workers=workers, batch_size=batch_size, rate_limit=rate_limit
+    )
+    click.secho(
+        f"{processed} records published again, {failed} failed.",
+        fg="red" if failed else "green",
+    )
+
+
 @migration.group()
 def stats():
     """Migration CLI for statistics."""
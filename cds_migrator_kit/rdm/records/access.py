@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM legacy files access status module."""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+ALLOW_GROUP_PATTERN = re.compile(r'allow group\s+((?:"[^"]+",?\s*)+)')
+ALLOW_EMAIL_PATTERN = re.compile(r'allow email\s+((?:"[^"]+",?\s*)+)')
+DENY_UNTIL_PATTERN = re.compile(r'deny until\s+"([^"]+)"')
+QUOTED_PATTERN = re.compile(r'"([^"]+)"')
+
+
+class FileStatus(NamedTuple):
+    """Parsed firerole status of a legacy file."""
+
+    groups: frozenset
+    emails: frozenset
+    deny_until: tuple
+
+
+def normalize_group_name(subject):
+    """Strip the legacy ``[CERN]`` suffix of a group name."""
+    if subject.endswith(" [CERN]"):
+        subject = subject.rsplit(" [CERN]", 1)[0]
+    return subject.strip()
+
+
+@lru_cache(maxsize=None)
+def parse_file_status(status):
+    """Parse a legacy firerole status.
+
+    Returns the groups and emails allowed by the status, and the dates of its
+    ``deny until`` rules as written in the status, or None if the status is not
+    in a supported format. Only a few thousand distinct statuses exist, so the
+    results are memoized by the raw status.
+    """
+    if not any(kw in status for kw in ("firerole: allow group", "allow email")):
+        return None
+
+    status = status.replace("\r\n", "\n")
+
+    groups = frozenset()
+    group_matches = ALLOW_GROUP_PATTERN.search(status)
+    if group_matches:
+        groups = frozenset(
+            normalize_group_name(group)
+            for group in QUOTED_PATTERN.findall(group_matches.group(1))
+        )
+
+    emails = frozenset()
+    email_matches = ALLOW_EMAIL_PATTERN.search(status)
+    if email_matches:
+        emails = frozenset(QUOTED_PATTERN.findall(email_matches.group(1)))
+
+    deny_until = tuple(DENY_UNTIL_PATTERN.findall(status))
+    return FileStatus(groups=groups, emails=emails, deny_until=deny_until)
+
+
+def is_supported_file_status(status, group_mappings):
+    """Check if the load can compute the access grants of a file status."""
+    return (
+        status == "restricted"
+        or status in group_mappings
+        or parse_file_status(status) is not None
+    )
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration original dumps store module."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+class OriginalDumpsStore:
+    """Content-addressed store of the original legacy dumps.
+
+    Each dump is written once to a JSON file named by the hash of its content.
+    The transformed entries only carry the path of that file, which the load
+    reads back when it saves the original dump.
+    """
+
+    def __init__(self, store_dir):
+        """Constructor."""
+        self.store_dir = Path(store_dir).absolute()
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+    def put(self, dump):
+        """Store a dump, and get the path referencing it."""
+        data = json.dumps(dump, ensure_ascii=False, separators=(",", ":")).encode()
+        key = hashlib.sha256(data).hexdigest()
+        path = self.store_dir / key[:2] / f"{key}.json"
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            # atomic, the workers can share the store directory
+            os.replace(tmp_path, path)
+        return path.as_posix()
+
+    @staticmethod
+    def get(ref):
+        """Read a stored dump from its path."""
+        with open(ref, "rb") as fp:
+            return json.load(fp)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration DOIs queue module.
+
+Records with a DOI minted on legacy are edited and published again after their
+migration, to update the DOI with the new metadata. The load can queue them in
+a SQLite file instead, processed later by ``invenio migration dois flush``.
+"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_rdm_records.proxies import current_rdm_records_service
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dois (
+    recid TEXT PRIMARY KEY,
+    legacy_recid TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS dois_status ON dois (status);
+"""
+
+
+class DOIsQueue:
+    """Queue of the records to publish again, persisted in a SQLite file."""
+
+    def __init__(self, filepath):
+        """Constructor."""
+        self.filepath = filepath
+        self._conn = sqlite3.connect(filepath, timeout=60, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def add(self, recid, legacy_recid=None):
+        """Queue a record, again if it was already processed."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO dois (recid, legacy_recid) VALUES (?, ?)",
+                (recid, legacy_recid and str(legacy_recid)),
+            )
+
+    def pending(self, limit):
+        """Get the next pending records ids."""
+        return [
+            recid
+            for (recid,) in self._conn.execute(
+                "SELECT recid FROM dois WHERE status = 'pending' LIMIT ?", (limit,)
+            )
+        ]
+
+    def mark(self, recid, status, error=None):
+        """Set the status of a queued record."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE dois SET status = ?, error = ? WHERE recid = ?",
+                (status, error, recid),
+            )
+
+    def reset_failed(self):
+        """Queue the failed records again."""
+        with self._conn:
+            self._conn.execute(
+                "UPDATE dois SET status = 'pending', error = NULL "
+                "WHERE status = 'failed'"
+            )
+
+    def counts(self):
+        """Count the queued records by status."""
+        return dict(
+            self._conn.execute("SELECT status, count(*) FROM dois GROUP BY status")
+        )
+
+
+def republish(app, recid):
+    """Edit and publish a record again, in its own application context."""
+    with app.app_context():
+        try:
+            draft = current_rdm_records_service.edit(system_identity, recid)
+            current_rdm_records_service.publish(system_identity, draft["id"])
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+def flush_dois_queue(filepath, workers=4, batch_size=100, rate_limit=None):
+    """Publish again the pending records of the queue.
+
+    Records are processed in batches of ``batch_size``, each batch in
+    ``workers`` threads, starting at most ``rate_limit`` records per second.
+    Returns the number of records processed and failed.
+    """
+    queue = DOIsQueue(filepath)
+    app = current_app._get_current_object()
+    processed = failed = 0
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            recids = queue.pending(batch_size)
+            if not recids:
+                break
+            futures = {}
+            for recid in recids:
+                if rate_limit:
+                    delay = started + processed / rate_limit - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                futures[recid] = executor.submit(republish, app, recid)
+                processed += 1
+            for recid, future in futures.items():
+                exc = future.exception()
+                if exc is None:
+                    queue.mark(recid, "done")
+                else:
+                    failed += 1
+                    queue.mark(recid, "failed", error=str(exc))
+                    current_app.logger.error(f"Failed to publish {recid} again: {exc}")
+    return processed, failed
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration load deferred indexing module."""
+
+from itertools import chain
+
+from flask import current_app
+from invenio_db import db
+from invenio_rdm_records.proxies import current_rdm_records_service
+from invenio_records_resources.services.uow import (
+    IndexRefreshOp,
+    Operation,
+    RecordBulkIndexOp,
+    RecordCommitOp,
+    RecordDeleteOp,
+    UnitOfWork,
+)
+from invenio_search.engine import search
+from invenio_search.utils import build_alias_name
+from sqlalchemy import event
+
+from cds_migrator_kit.rdm.records.lookups import chunked
+
+
+class DeferredIndexing:
+    """Queue of the records and drafts to index in bulk.
+
+    The ids of the records, drafts and parents written by the session of the
+    load are queued on each flush, and the queued records and drafts, along
+    with all the versions of the queued parents, are indexed in bulk requests
+    on :meth:`flush`. The records are read from the database, so it must only
+    be called once they are committed.
+    """
+
+    def __init__(self, flush_interval=None, chunk_size=500):
+        """Constructor."""
+        self.flush_interval = flush_interval
+        # number of records indexed per bulk request
+        self.chunk_size = chunk_size
+        service = current_rdm_records_service
+        self._indexers = {
+            service.record_cls.model_cls: service.indexer,
+            service.draft_cls.model_cls: service.draft_indexer,
+        }
+        self._parent_model_cls = service.record_cls.parent_record_cls.model_cls
+        self._ids = {model_cls: set() for model_cls in self._indexers}
+        self._parent_ids = set()
+        self._records = 0
+
+    def listen(self, session):
+        """Queue the records written by a session."""
+        if not event.contains(session, "after_flush", self._after_flush):
+            event.listen(session, "after_flush", self._after_flush)
+
+    def _after_flush(self, session, flush_context):
+        """Queue the records, drafts and parents of a flush."""
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if isinstance(obj, self._parent_model_cls):
+                self._parent_ids.add(obj.id)
+            elif type(obj) in self._ids:
+                self._ids[type(obj)].add(obj.id)
+
+    def record_loaded(self):
+        """Count a loaded record, flushing every ``flush_interval`` records."""
+        self._records += 1
+        if self.flush_interval and self._records >= self.flush_interval:
+            self.flush()
+
+    def _actions(self, indexer, ids):
+        """Bulk actions indexing the records, or deleting the missing ones."""
+        records = indexer.record_cls.get_records(ids)
+        for record in records:
+            index = indexer.record_to_index(record)
+            yield {
+                "_op_type": "index",
+                "_index": build_alias_name(index),
+                "_id": str(record.id),
+                "_version": record.revision_id,
+                "_version_type": "external_gte",
+                "_source": record.dumps(dumper=indexer.record_dumper),
+            }
+        # deleted, or rolled back with a failed record
+        found = {record.id for record in records}
+        # the index is set on the record class
+        index = build_alias_name(indexer.record_to_index(indexer.record_cls))
+        for record_id in set(ids) - found:
+            yield {"_op_type": "delete", "_index": index, "_id": str(record_id)}
+
+    def flush(self):
+        """Index the queued records with the bulk API."""
+        if self._parent_ids:
+            # all the versions of the parents are reindexed, as the services do
+            model_cls = current_rdm_records_service.record_cls.model_cls
+            for parent_ids in chunked(list(self._parent_ids), self.chunk_size):
+                versions = db.session.query(model_cls.id).filter(
+                    model_cls.parent_id.in_(parent_ids)
+                )
+                self._ids[model_cls].update(record_id for (record_id,) in versions)
+        for model_cls, ids in self._ids.items():
+            indexer = self._indexers[model_cls]
+            for chunk in chunked(sorted(ids), self.chunk_size):
+                search.helpers.bulk(
+                    indexer.client,
+                    self._actions(indexer, chunk),
+                    ignore_status=(404,),
+                    request_timeout=current_app.config["INDEXER_BULK_REQUEST_TIMEOUT"],
+                )
+            ids.clear()
+        self._parent_ids.clear()
+        self._records = 0
+
+
+class WithoutIndexingOp(Operation):
+    """Operation of a unit of work, without its indexing."""
+
+    def __init__(self, op):
+        """Constructor."""
+        self.op = op
+
+    def on_register(self, uow):
+        """Run the operation, e.g. commit or delete its record."""
+        self.op.on_register(uow)
+
+    def on_exception(self, uow, exception):
+        """Run the operation exception handling."""
+        self.op.on_exception(uow, exception)
+
+    def on_rollback(self, uow):
+        """Run the operation rollback."""
+        self.op.on_rollback(uow)
+
+    def on_post_rollback(self, uow):
+        """Run the operation post rollback."""
+        self.op.on_post_rollback(uow)
+
+
+class DeferredIndexingUnitOfWork(UnitOfWork):
+    """Unit of work leaving the indexing of its records to a deferred indexing.
+
+    The records, drafts and parents are committed or deleted as usual, but not
+    indexed, and the bulk indexing and refresh operations are dropped. The
+    records are queued from the session instead.
+    """
+
+    def __init__(self, deferred_indexing, session=None):
+        """Constructor."""
+        super().__init__(session=session)
+        deferred_indexing.listen(session or db.session())
+
+    def register(self, op):
+        """Register an operation, without its indexing."""
+        if isinstance(op, (RecordBulkIndexOp, IndexRefreshOp)):
+            return
+        if isinstance(op, (RecordCommitOp, RecordDeleteOp)):
+            op = WithoutIndexingOp(op)
+        return super().register(op)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration original legacy dumps writer module."""
+
+import gzip
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from cds_rdm.legacy.models import CDSMigrationLegacyRecord
+from invenio_db import db
+
+from cds_migrator_kit.import_utils import import_module
+
+DUMPS_EXTENSIONS = {None: ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+"""Extension of the dumps files, by compression."""
+
+DUMPS_STORES = ("database", "files")
+"""Stores of the original dumps: the rows themselves, or files they reference."""
+
+
+def compress_dump(data, compression=None):
+    """Serialize and compress an original dump."""
+    data = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+class LegacyRecordsWriter:
+    """Writer of the original dumps of the migrated records.
+
+    The dumps are stored in the ``json`` column of their rows, or, with the
+    ``files`` store, written to files of ``dumps_dir`` named by legacy recid
+    and compressed with ``compression``, the column only referencing them.
+
+    When the records are committed in batches, the rows of the loaded records
+    are buffered, and inserted together with multi-row inserts on
+    :meth:`flush`, due every ``batch_size`` records, in the transaction of
+    their records.
+    """
+
+    def __init__(
+        self, batch_size=None, store="database", dumps_dir=None, compression=None
+    ):
+        """Constructor."""
+        if store not in DUMPS_STORES:
+            raise ValueError(f"Unknown original dumps store: {store}.")
+        if store == "files" and not dumps_dir:
+            raise ValueError("The files store of the original dumps needs a directory.")
+        if compression not in DUMPS_EXTENSIONS:
+            raise ValueError(f"Unknown original dumps compression: {compression}.")
+        if compression and store != "files":
+            raise ValueError("Only the original dumps files can be compressed.")
+        if compression == "zstd" and not import_module("zstandard"):
+            raise ValueError("The zstd compression requires the zstandard package.")
+        self.batch_size = batch_size
+        self.dumps_dir = Path(dumps_dir) if store == "files" else None
+        self.compression = compression
+        # rows of the record being loaded, and of the loaded records
+        self._pending = []
+        self._rows = []
+
+    def _write_dump(self, legacy_recid, original_dump):
+        """Write a dump to its file, and get the reference stored in its row."""
+        filename = f"{legacy_recid}{DUMPS_EXTENSIONS[self.compression]}"
+        path = self.dumps_dir / str(legacy_recid)[-2:] / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(compress_dump(original_dump, self.compression))
+        os.replace(tmp_path, path)
+        return {
+            "legacy_recid": legacy_recid,
+            "file": path.relative_to(self.dumps_dir).as_posix(),
+            "compression": self.compression,
+        }
+
+    def row(
+        self,
+        legacy_recid,
+        parent_object_uuid,
+        migrated_record_object_uuid,
+        original_dump,
+    ):
+        """Get the row of the original dump of a record, as a dictionary."""
+        if self.dumps_dir:
+            original_dump = self._write_dump(legacy_recid, original_dump)
+        return dict(
+            json=original_dump,
+            parent_object_uuid=parent_object_uuid,
+            migrated_record_object_uuid=migrated_record_object_uuid,
+            legacy_recid=legacy_recid,
+        )
+
+    def add(self, **kwargs):
+        """Add the original dump of the record being loaded."""
+        self._pending.append(self.row(**kwargs))
+
+    @contextmanager
+    def record(self):
+        """Buffer the rows added while loading a record, unless it fails.
+
+        Wraps the savepoint of the record, so that the rows are only inserted
+        once it is released.
+        """
+        self._pending = []
+        try:
+            yield
+        except Exception:
+            self._pending = []
+            raise
+        self._rows.extend(self._pending)
+        self._pending = []
+
+    def is_due(self):
+        """Whether the buffered rows are to be inserted."""
+        return bool(self.batch_size) and len(self._rows) >= self.batch_size
+
+    def flush(self):
+        """Insert the rows of the loaded records, without committing them.
+
+        The rows are inserted in a savepoint, so that a failing row does not
+        roll back the records of the transaction. A failing batch is inserted
+        again one row at a time, to isolate the failing rows.
+
+        Returns the legacy recid of each row failing to insert, with its error.
+        """
+        rows, self._rows = self._rows, []
+        if not rows:
+            return []
+        try:
+            with db.session.begin_nested():
+                # inserted in batches of multi-row inserts by the session flush
+                db.session.add_all(CDSMigrationLegacyRecord(**row) for row in rows)
+        except Exception:
+            errors = []
+            for row in rows:
+                try:
+                    with db.session.begin_nested():
+                        db.session.add(CDSMigrationLegacyRecord(**row))
+                except Exception as exc:
+                    errors.append((row["legacy_recid"], exc))
+            return errors
+        return []
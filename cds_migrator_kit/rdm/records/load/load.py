@@ -7,21 +7,33 @@
 
 """CDS-RDM migration load module."""
 import datetime
+import hashlib
 import json
+import logging
+import multiprocessing
 import os
+import queue
 import re
-from copy import deepcopy
+import shutil
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from functools import partial
+from itertools import islice
+from logging.handlers import QueueListener
+from pathlib import Path
 
 import arrow
 from cds_rdm.clc_sync.models import CDSToCLCSyncModel
 from cds_rdm.legacy.models import CDSMigrationLegacyRecord
-from cds_rdm.legacy.resolver import get_pid_by_legacy_recid
 from cds_rdm.minters import legacy_recid_minter
 from flask import current_app
 from invenio_access.permissions import system_identity
-from invenio_accounts.models import User
+from invenio_communities.communities.records.api import Community
 from invenio_db import db
-from invenio_pidstore.errors import PIDAlreadyExists
+from invenio_pidstore.errors import PIDAlreadyExists, PIDDoesNotExistError
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_rdm_migrator.load.base import Load
 from invenio_rdm_records.proxies import current_rdm_records_service
@@ -33,19 +45,89 @@ from cds_migrator_kit.errors import (
     GrantCreationError,
     ManualImportRequired,
 )
+from cds_migrator_kit.rdm.records.access import (
+    normalize_group_name,
+    parse_file_status,
+)
+from cds_migrator_kit.rdm.records.dumps import OriginalDumpsStore
+from cds_migrator_kit.rdm.records.load import workers
+from cds_migrator_kit.rdm.records.load.dois import DOIsQueue
+from cds_migrator_kit.rdm.records.load.indexing import (
+    DeferredIndexing,
+    DeferredIndexingUnitOfWork,
+)
+from cds_migrator_kit.rdm.records.load.legacy_records import LegacyRecordsWriter
+from cds_migrator_kit.rdm.records.load.redirects import mint_legacy_redirects
+from cds_migrator_kit.rdm.records.load.staging import FilesStaging
+from cds_migrator_kit.rdm.records.load.transactions import BatchedCommits
+from cds_migrator_kit.rdm.records.snapshot import LookupsSnapshot
+from cds_migrator_kit.reports.log import DeferredLogger, LogRecordDispatcher
+from cds_migrator_kit.users.lookups import UsersLookup
 
+FILES_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+"""Size up to which the prefetched files are kept in memory."""
 
-def import_legacy_files(filepath):
-    """Download file from legacy."""
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+
+def load_partition(entry, partitions):
+    """Get the partition of an entry, by the legacy recid of the record."""
+    recid = entry.get("record", {}).get("recid")
+    return zlib.crc32(str(recid).encode()) % partitions
+
+
+def legacy_file_path(filepath):
+    """Get the path of the legacy file to import."""
     if current_app.config["CDS_MIGRATOR_KIT_ENV"] == "local":
         import cds_migrator_kit
 
         base_path = os.path.dirname(os.path.realpath(cds_migrator_kit.__file__))
         filepath = os.path.join(base_path, "rdm/data/files/dummy.pdf")
-    filestream = open(filepath, "rb")
+    return filepath
+
+
+def import_legacy_files(filepath):
+    """Download file from legacy."""
+    filestream = open(legacy_file_path(filepath), "rb")
     return filestream
 
 
+def spool_legacy_file(filepath, tmp_dir=None):
+    """Read a legacy file to a temporary file, kept in memory if small enough.
+
+    Does not need the application context, to be called from other threads.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=FILES_SPOOL_MAX_SIZE, dir=tmp_dir)
+    with open(filepath, "rb") as fp:
+        shutil.copyfileobj(fp, spool)
+    spool.seek(0)
+    return spool
+
+
+class ChecksumStream:
+    """Compute the md5 checksum of a stream while it is read."""
+
+    def __init__(self, stream):
+        """Constructor."""
+        self._stream = stream
+        self._md5 = hashlib.md5()
+
+    def read(self, *args, **kwargs):
+        """Read from the stream and update the checksum."""
+        data = self._stream.read(*args, **kwargs)
+        self._md5.update(data)
+        return data
+
+    def __getattr__(self, name):
+        """Delegate everything else to the stream."""
+        return getattr(self._stream, name)
+
+    @property
+    def checksum(self):
+        """Checksum of the bytes read so far, in the files service format."""
+        return f"md5:{self._md5.hexdigest()}"
+
+
 class CDSRecordServiceLoad(Load):
     """CDSRecordServiceLoad."""
 
@@ -60,33 +142,177 @@ class CDSRecordServiceLoad(Load):
         collection=None,
         migration_logger=None,
         record_state_logger=None,
+        users_lookup=None,
+        offline_snapshot=None,
+        files_workers=None,
+        commit_batch_size=None,
+        commit_batch_interval=None,
+        defer_indexing=False,
+        index_flush_interval=1000,
+        dois_queue=None,
+        workers=None,
+        skip_version_update=False,
+        legacy_records_batch_size=None,
+        legacy_records_store="database",
+        legacy_records_dir=None,
+        legacy_records_compression=None,
+        redirects_chunk_size=1000,
+        files_staging_dir=None,
+        files_staging_max_size=10 * 1024**3,
+        files_staging_lookahead=10,
     ):
         """Constructor."""
+        # number of processes loading the records in parallel
+        self.workers = workers
+        self._worker_kwargs = dict(
+            db_uri=db_uri,
+            data_dir=data_dir,
+            tmp_dir=tmp_dir,
+            dry_run=dry_run,
+            legacy_pids_to_redirect=legacy_pids_to_redirect,
+            collection=collection,
+            offline_snapshot=offline_snapshot,
+            files_workers=files_workers,
+            commit_batch_size=commit_batch_size,
+            commit_batch_interval=commit_batch_interval,
+            defer_indexing=defer_indexing,
+            index_flush_interval=index_flush_interval,
+            dois_queue=dois_queue,
+            skip_version_update=skip_version_update,
+            legacy_records_batch_size=legacy_records_batch_size,
+            legacy_records_store=legacy_records_store,
+            legacy_records_dir=legacy_records_dir,
+            legacy_records_compression=legacy_records_compression,
+            redirects_chunk_size=redirects_chunk_size,
+            files_staging_dir=files_staging_dir,
+            files_staging_max_size=files_staging_max_size,
+            files_staging_lookahead=files_staging_lookahead,
+        )
+        # set the publication date of the new versions without updating their
+        # draft through the service, or "compare" to log the differences
+        self.skip_version_update = skip_version_update
         self.dry_run = dry_run
+        self.tmp_dir = tmp_dir
+        # number of threads reading the files of a record ahead of their upload
+        self.files_workers = files_workers
+        self.snapshot = offline_snapshot and LookupsSnapshot(offline_snapshot)
+        # the records are written by the workers, if loading in parallel
+        writes = not dry_run and not workers
+        # files of the next records copied to a local directory ahead of the load
+        self.files_staging = None
+        self.files_staging_lookahead = files_staging_lookahead
+        if writes and files_staging_dir:
+            self.files_staging = FilesStaging(
+                files_staging_dir,
+                max_size=files_staging_max_size,
+                workers=files_workers or 4,
+            )
+        self.batched_commits = None
+        if writes and (commit_batch_size or commit_batch_interval):
+            self.batched_commits = BatchedCommits(
+                batch_size=commit_batch_size, batch_interval=commit_batch_interval
+            )
+        self.deferred_indexing = None
+        if writes and defer_indexing:
+            self.deferred_indexing = DeferredIndexing(
+                flush_interval=index_flush_interval
+            )
+        self.legacy_records_writer = None
+        if writes:
+            self.legacy_records_writer = LegacyRecordsWriter(
+                batch_size=legacy_records_batch_size,
+                store=legacy_records_store,
+                dumps_dir=legacy_records_dir,
+                compression=legacy_records_compression,
+            )
         self.legacy_pids_to_redirect = {}
+        # number of legacy redirections minted per transaction
+        self.redirects_chunk_size = redirects_chunk_size
+        self._loaded_files = {}
+        # communities ids, by id or slug, resolved during the run
+        self._communities = {}
         self.clc_sync = False
         self.collection = collection
         self.migration_logger = migration_logger
         self.record_state_logger = record_state_logger
+        self.users_lookup = users_lookup or UsersLookup()
+        # grants and grant subjects validated during the run
+        self._valid_grants = set()
+        self._valid_grant_subjects = {}
+        self.dois_queue = None
+        if not dry_run and dois_queue:
+            self.dois_queue = DOIsQueue(dois_queue)
         if legacy_pids_to_redirect is not None:
             with open(legacy_pids_to_redirect, "r") as fp:
                 self.legacy_pids_to_redirect = json.load(fp)
 
+    def _service_call(self, method, *args, **kwargs):
+        """Call a records service method, deferring its indexing if enabled."""
+        if not self.deferred_indexing:
+            return method(*args, **kwargs)
+        with DeferredIndexingUnitOfWork(self.deferred_indexing) as uow:
+            result = method(*args, uow=uow, **kwargs)
+            uow.commit()
+        return result
+
     def _prepare(self, entry):
         """Prepare the record."""
         pass
 
+    def _files_contents(self, version_files):
+        """Iterate over the files with a function returning their content.
+
+        With ``files_workers``, the contents are read ahead in a thread pool,
+        while the files are uploaded by the services in the current thread.
+        With the files staging, they are read from the staged copies.
+        """
+        if self.files_staging:
+            for filename, file_data in version_files.items():
+                source = str(legacy_file_path(file_data["eos_tmp_path"]))
+                yield filename, file_data, partial(self.files_staging.open, source)
+            return
+
+        if not self.files_workers:
+            for filename, file_data in version_files.items():
+                content = partial(import_legacy_files, file_data["eos_tmp_path"])
+                yield filename, file_data, content
+            return
+
+        Path(self.tmp_dir).mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.files_workers) as executor:
+            # two files spooled per reader ahead of the upload, small ones held in
+            # memory, so a record with thousands of files is not read at once
+            window = deque()
+            files = iter(version_files.items())
+            try:
+                while True:
+                    for filename, file_data in islice(
+                        files, 2 * self.files_workers - len(window)
+                    ):
+                        future = executor.submit(
+                            spool_legacy_file,
+                            legacy_file_path(file_data["eos_tmp_path"]),
+                            self.tmp_dir,
+                        )
+                        window.append((filename, file_data, future))
+                    if not window:
+                        return
+                    filename, file_data, future = window.popleft()
+                    yield filename, file_data, future.result
+            finally:
+                for _, _, future in window:
+                    future.cancel()
+
     def _load_files(self, draft, entry, version_files):
         """Load files to draft."""
         recid = entry.get("record", {}).get("recid", {})
         identity = system_identity  # Should we create an identity for the migration?
 
-        for filename, file_data in version_files.items():
-
-            file_data = version_files[filename]
-
+        contents = self._files_contents(version_files)
+        for filename, file_data, content in contents:
             try:
-                current_rdm_records_service.draft_files.init_files(
+                self._service_call(
+                    current_rdm_records_service.draft_files.init_files,
                     identity,
                     draft.id,
                     data=[
@@ -119,17 +345,17 @@ class CDSRecordServiceLoad(Load):
                 #     path = obj.file.uri
                 # else:
                 # for local development
-                current_rdm_records_service.draft_files.set_file_content(
+                stream = ChecksumStream(content())
+                self._service_call(
+                    current_rdm_records_service.draft_files.set_file_content,
                     identity,
                     draft.id,
                     file_data["key"],
-                    import_legacy_files(file_data["eos_tmp_path"]),
-                )
-                result = current_rdm_records_service.draft_files.commit_file(
-                    identity, draft.id, file_data["key"]
+                    stream,
                 )
+                # verify the bytes as they were copied, before committing the file
                 legacy_checksum = f"md5:{file_data['checksum']}"
-                new_checksum = result.to_dict()["checksum"]
+                new_checksum = stream.checksum
                 if current_app.config["CDS_MIGRATOR_KIT_ENV"] != "local":
                     try:
                         assert legacy_checksum == new_checksum
@@ -143,6 +369,21 @@ class CDSRecordServiceLoad(Load):
                             value=file_data["key"],
                             subfield=None,
                         )
+                committed_file = self._service_call(
+                    current_rdm_records_service.draft_files.commit_file,
+                    identity,
+                    draft.id,
+                    file_data["key"],
+                ).to_dict()
+                # kept for the record state, the published record has the same files
+                self._loaded_files.setdefault(draft.id, []).append(
+                    {
+                        "legacy_file_id": file_data["id_bibdoc"],
+                        "file_key": file_data["key"],
+                        "file_id": committed_file["file_id"],
+                        "size": str(committed_file["size"]),
+                    }
+                )
 
             except Exception as e:
                 exc = ManualImportRequired(
@@ -154,7 +395,15 @@ class CDSRecordServiceLoad(Load):
                     priority="critical",
                 )
                 self.migration_logger.add_log(exc, record=entry)
+                # cancel the files read ahead
+                contents.close()
                 raise e
+            finally:
+                # the staged copy is not read again, whether the file loaded or not
+                if self.files_staging:
+                    self.files_staging.release(
+                        str(legacy_file_path(file_data["eos_tmp_path"]))
+                    )
 
     def _load_parent_access(self, draft, entry):
         """Load access rights."""
@@ -163,21 +412,39 @@ class CDSRecordServiceLoad(Load):
         access = entry["parent"]["json"]["access"]
         parent.access = access
 
-        parent.commit()
-
     def _load_record_access(self, draft, access_dict):
         record = draft._record
 
         record.access = access_dict["access_obj"]
         record.commit()
 
+    def _resolve_community(self, entry, community):
+        """Resolve a community id or slug to its id, once per run."""
+        if community not in self._communities:
+            try:
+                resolved = Community.pid.resolve(community)
+            except PIDDoesNotExistError:
+                raise ManualImportRequired(
+                    message=f"Community {community} does not exist.",
+                    field="communities",
+                    stage="load",
+                    recid=entry["record"]["recid"],
+                    priority="critical",
+                    value=community,
+                )
+            self._communities[community] = str(resolved.id)
+        return self._communities[community]
+
     def _load_communities(self, draft, entry):
         parent = draft._record.parent
         communities = entry["parent"]["json"]["communities"]["ids"]
         for community in communities:
-            parent.communities.add(community)
-        parent.communities.default = entry["parent"]["json"]["communities"]["default"]
-        parent.commit()
+            parent.communities.add(self._resolve_community(entry, community))
+        default = entry["parent"]["json"]["communities"]["default"]
+        if isinstance(default, str):
+            # by id or slug as well, set as the id it was added with
+            default = self._resolve_community(entry, default)
+        parent.communities.default = default
 
     def _after_publish_update_dois(self, identity, record, entry):
         """Update migrated DOIs post publish."""
@@ -188,17 +455,19 @@ class CDSRecordServiceLoad(Load):
                 # will return a warning that "This DOI has already been taken"
                 # In that case, we edit and republish to force an update of the doi with
                 # the new published metadata as in the new system we have more information available
-                _draft = current_rdm_records_service.edit(identity, record["id"])
-                current_rdm_records_service.publish(identity, _draft["id"])
+                if self.dois_queue:
+                    # published again by `invenio migration dois flush`
+                    self.dois_queue.add(record["id"], entry["record"]["recid"])
+                    continue
+                _draft = self._service_call(
+                    current_rdm_records_service.edit, identity, record["id"]
+                )
+                self._service_call(
+                    current_rdm_records_service.publish, identity, _draft["id"]
+                )
 
     def _after_publish_load_parent_access_grants(self, draft, access_dict, entry):
         """Load access grants from metadata and record grants efficiently."""
-
-        def _normalize_group_name(subject):
-            if subject.endswith(" [CERN]"):
-                subject = subject.rsplit(" [CERN]", 1)[0]
-            return subject.strip()
-
         parent = draft._record.parent
         identity = system_identity
 
@@ -211,7 +480,6 @@ class CDSRecordServiceLoad(Load):
         groups = set()
         emails = set()
         grants_with_perms = {}
-        email_pattern = re.compile(r"[^@]+@[^@]+\.[^@]+")
 
         # ----Parse file status metadata----#
         if metadata:
@@ -221,9 +489,8 @@ class CDSRecordServiceLoad(Load):
             elif metadata == "restricted":
                 pass
             else:
-                if not any(
-                    kw in metadata for kw in ("firerole: allow group", "allow email")
-                ):
+                file_status = parse_file_status(metadata)
+                if file_status is None:
                     raise ManualImportRequired(
                         message="Unexpected permission format.",
                         field="access",
@@ -232,25 +499,8 @@ class CDSRecordServiceLoad(Load):
                         recid=entry["record"]["recid"],
                         priority="critical",
                     )
-
-                meta_str = metadata.replace("\r\n", "\n")
-
-                # Parse groups
-                group_matches = re.search(
-                    r'allow group\s+((?:"[^"]+",?\s*)+)', meta_str
-                )
-                if group_matches:
-                    group_values = re.findall(r'"([^"]+)"', group_matches.group(1))
-                    for g in group_values:
-                        groups.add(_normalize_group_name(g))
-
-                # Parse emails
-                email_matches = re.search(
-                    r'allow email\s+((?:"[^"]+",?\s*)+)', meta_str
-                )
-                if email_matches:
-                    email_values = re.findall(r'"([^"]+)"', email_matches.group(1))
-                    emails.update(email_values)
+                groups.update(file_status.groups)
+                emails.update(file_status.emails)
 
         # ----Parse record access grants----#
 
@@ -262,25 +512,30 @@ class CDSRecordServiceLoad(Load):
             permission = permission or default_permission
             grants_with_perms[subject] = permission
 
-            if email_pattern.match(subject):
+            if EMAIL_PATTERN.match(subject):
                 emails.add(subject)
             else:
-                groups.add(_normalize_group_name(subject))
+                groups.add(normalize_group_name(subject))
+
+        is_local_dev = current_app.config.get("CDS_MIGRATOR_KIT_ENV") == "local"
 
         def _create_grant(subject_type, subject_id, permission):
-            grant_data = {
-                "grants": [
-                    {
-                        "subject": {"type": subject_type, "id": str(subject_id)},
-                        "permission": permission,
-                    }
-                ]
-            }
-            current_rdm_records_service.access.schema_grants.load(
-                grant_data,
-                context={"identity": identity},
-                raise_errors=True,
-            )
+            grant_key = (subject_type, str(subject_id), permission)
+            if grant_key not in self._valid_grants:
+                grant_data = {
+                    "grants": [
+                        {
+                            "subject": {"type": subject_type, "id": str(subject_id)},
+                            "permission": permission,
+                        }
+                    ]
+                }
+                current_rdm_records_service.access.schema_grants.load(
+                    grant_data,
+                    context={"identity": identity},
+                    raise_errors=True,
+                )
+                self._valid_grants.add(grant_key)
 
             grant = parent.access.grants.create(
                 subject_type=subject_type,
@@ -289,16 +544,16 @@ class CDSRecordServiceLoad(Load):
                 origin="migrated",
             )
 
-            is_local_dev = current_app.config.get("CDS_MIGRATOR_KIT_ENV") == "local"
-            print("VALIDATION CHECK:",
-                current_app.config.get("CDS_MIGRATOR_KIT_ENV"),
-                is_local_dev,
-                grant.subject_id,
-                current_rdm_records_service.access._validate_grant_subject(identity, grant))
-
-            if (
-                not is_local_dev and not current_rdm_records_service.access._validate_grant_subject(identity, grant)
-            ):
+            if is_local_dev:
+                return
+            subject_key = (subject_type, str(subject_id))
+            if subject_key not in self._valid_grant_subjects:
+                self._valid_grant_subjects[subject_key] = (
+                    current_rdm_records_service.access._validate_grant_subject(
+                        identity, grant
+                    )
+                )
+            if not self._valid_grant_subjects[subject_key]:
                 raise ManualImportRequired(
                     message="Verification of access subject failed (likely not existing entry)",
                     field="access",
@@ -318,10 +573,7 @@ class CDSRecordServiceLoad(Load):
             )
 
         # Fetch existing users
-        existing_users = {
-            user.email: user.id
-            for user in User.query.filter(User.email.in_(emails)).all()
-        }
+        existing_users = self.users_lookup.get_many(emails)
         # raise error for missing user
         missing_emails = emails - existing_users.keys()
         if missing_emails:
@@ -402,6 +654,34 @@ class CDSRecordServiceLoad(Load):
         self._after_publish_load_parent_access_grants(published_record, access, entry)
         db.session.commit()
 
+    def _set_new_version_publication_date(self, draft, publication_date):
+        """Set the publication date of a new version draft directly.
+
+        The new version draft already holds the metadata of the previous
+        version but its publication date, so the draft is not updated through
+        the service.
+        """
+        record = draft._record
+        record["metadata"]["publication_date"] = publication_date.date().isoformat()
+        record.commit()
+
+    def _compare_new_version_metadata(self, entry, version, skipped, updated):
+        """Log the differences between the new version with and without update."""
+        fields = sorted(
+            key
+            for key in skipped.keys() | updated.keys()
+            if skipped.get(key) != updated.get(key)
+        )
+        if fields:
+            self.migration_logger.add_information(
+                entry["record"]["recid"],
+                {
+                    "message": f"Version {version} without the service update "
+                    "differs from the updated one.",
+                    "value": fields,
+                },
+            )
+
     def _pre_publish(self, identity, entry, version, draft):
         """Create and process draft before publish."""
         versions = entry["versions"]
@@ -414,8 +694,10 @@ class CDSRecordServiceLoad(Load):
             # and we don't have index 1
             # we decided to skip it and act normal
             try:
-                draft = current_rdm_records_service.create(
-                    identity, data=entry["record"]["json"]
+                draft = self._service_call(
+                    current_rdm_records_service.create,
+                    identity,
+                    data=entry["record"]["json"],
                 )
             except Exception as e:
 
@@ -433,9 +715,24 @@ class CDSRecordServiceLoad(Load):
             # TODO we can use unit of work when it is moved to invenio-db module
             self._load_parent_access(draft, entry)
             self._load_communities(draft, entry)
+            draft._record.parent.commit()
             db.session.commit()
         else:
-            draft = current_rdm_records_service.new_version(identity, draft["id"])
+            draft = self._service_call(
+                current_rdm_records_service.new_version, identity, draft["id"]
+            )
+            if self.skip_version_update is True:
+                self._set_new_version_publication_date(draft, publication_date)
+                self._load_record_access(draft, access)
+                self._load_files(draft, entry, files)
+                return draft
+            # the draft published without the update, compared to the updated one
+            skipped_metadata = None
+            if self.skip_version_update == "compare":
+                skipped_metadata = {
+                    **draft._record["metadata"],
+                    "publication_date": publication_date.date().isoformat(),
+                }
             draft_dict = draft.to_dict()
             missing_data = {
                 **draft_dict,
@@ -447,9 +744,16 @@ class CDSRecordServiceLoad(Load):
                     "publication_date": publication_date.date().isoformat(),
                 },
             }
-            draft = current_rdm_records_service.update_draft(
-                identity, draft["id"], data=missing_data
+            draft = self._service_call(
+                current_rdm_records_service.update_draft,
+                identity,
+                draft["id"],
+                data=missing_data,
             )
+            if skipped_metadata is not None:
+                self._compare_new_version_metadata(
+                    entry, version, skipped_metadata, draft._record["metadata"]
+                )
         self._load_record_access(draft, access)
         self._load_files(draft, entry, files)
 
@@ -462,6 +766,8 @@ class CDSRecordServiceLoad(Load):
 
         identity = system_identity
 
+        # files loaded to each draft, by id
+        self._loaded_files = {}
         records = []
         # initial value of draft. If different file versions identified then the first
         # created draft is used to populate all newer versions
@@ -471,8 +777,8 @@ class CDSRecordServiceLoad(Load):
             draft = self._pre_publish(identity, entry, version, draft)
 
             # Publish draft
-            published_record = current_rdm_records_service.publish(
-                identity, draft["id"]
+            published_record = self._service_call(
+                current_rdm_records_service.publish, identity, draft["id"]
             )
             # Run after publish fixes
             self._after_publish(identity, published_record, entry, version)
@@ -522,29 +828,15 @@ class CDSRecordServiceLoad(Load):
         }
         """
 
-        def convert_file_format(file_entries, bucket_id):
-            """Convert the file metadata into the required format."""
-            return [
-                {
-                    "legacy_file_id": entry["metadata"]["legacy_file_id"],
-                    "bucket_id": bucket_id,
-                    "file_key": entry["key"],
-                    "file_id": entry["file_id"],
-                    "size": str(entry["size"]),
-                }
-                for entry in file_entries.values()
-            ]
-
         def extract_record_version(record):
             """Extract relevant details from a single record."""
             bucket_id = str(record.files.bucket_id)
-            files = record.__class__.files.dump(
-                record, record.files, include_entries=True
-            ).get("entries", {})
+            # files as loaded to the draft, without reading them back
+            files = self._loaded_files.get(record.pid.pid_value, [])
             return {
                 "new_recid": record.pid.pid_value,
                 "version": record.versions.index,
-                "files": convert_file_format(files, bucket_id),
+                "files": [{**file, "bucket_id": bucket_id} for file in files],
             }
 
         recid_state = {"legacy_recid": legacy_recid, "versions": []}
@@ -561,10 +853,10 @@ class CDSRecordServiceLoad(Load):
             # Save the record versions for legacy recid
             recid_state["versions"].append(recid_version)
 
-            if "latest_version" not in recid_state:
-                rec = record.get_latest_by_parent(record.parent)
-                recid_state["latest_version"] = rec["id"]
-                recid_state["latest_version_object_uuid"] = str(rec.id)
+        # the versions are published in order, the last one is the latest
+        latest = records[-1]
+        recid_state["latest_version"] = latest.pid.pid_value
+        recid_state["latest_version_object_uuid"] = str(latest.id)
         return recid_state
 
     def _save_original_dumped_record(self, entry, recid_state):
@@ -572,19 +864,33 @@ class CDSRecordServiceLoad(Load):
 
         This is the originally extracted record before any transformation.
         """
-        _original_dump = entry["_original_dump"]
+        if "_original_dump_ref" in entry:
+            # spilled to the original dumps store by the transform
+            _original_dump = OriginalDumpsStore.get(entry["_original_dump_ref"])
+        else:
+            _original_dump = entry["_original_dump"]
 
-        _original_dump_model = CDSMigrationLegacyRecord(
-            json=_original_dump,
+        legacy_record = dict(
+            legacy_recid=entry["record"]["recid"],
             parent_object_uuid=recid_state["parent_object_uuid"],
             migrated_record_object_uuid=recid_state["latest_version_object_uuid"],
-            legacy_recid=entry["record"]["recid"],
+            original_dump=_original_dump,
+        )
+        if self.batched_commits:
+            # inserted with the batch of loaded records
+            self.legacy_records_writer.add(**legacy_record)
+            return
+
+        _original_dump_model = CDSMigrationLegacyRecord(
+            **self.legacy_records_writer.row(**legacy_record)
         )
         db.session.add(_original_dump_model)
         db.session.commit()
 
     def _have_migrated_recid(self, recid):
         """Check if we have minted `lrecid` pid."""
+        if self.snapshot:
+            return self.snapshot.legacy_recid_status(recid) is not None
         pid = PersistentIdentifier.query.filter_by(
             pid_type="lrecid",
             pid_value=recid,
@@ -607,13 +913,33 @@ class CDSRecordServiceLoad(Load):
             db.session.add(sync)
             db.session.commit()
 
+    def _record_transaction(self):
+        """Transaction of a record, its own savepoint if commits are batched."""
+        if self.batched_commits:
+            return self.batched_commits.record()
+        return nullcontext()
+
+    def _legacy_records(self):
+        """Original dumps of a record, buffered if the load succeeds."""
+        if self.batched_commits:
+            return self.legacy_records_writer.record()
+        return nullcontext()
+
+    def _record_loaded(self):
+        """Commit and index the loaded records, when due."""
+        if self.batched_commits:
+            if self.batched_commits.is_due():
+                self._flush()
+            elif self.legacy_records_writer.is_due():
+                self._flush_legacy_records()
+        elif self.deferred_indexing:
+            self.deferred_indexing.record_loaded()
+
     def _load(self, entry):
         """Use the services to load the entries."""
         if entry:
 
-            self.clc_sync = deepcopy(entry.get("_clc_sync", False))
-            if "_clc_sync" in entry:
-                del entry["_clc_sync"]
+            self.clc_sync = entry.pop("_clc_sync", False)
 
             recid = entry.get("record", {}).get("recid", {})
 
@@ -624,15 +950,17 @@ class CDSRecordServiceLoad(Load):
                 if self.dry_run:
                     self._dry_load(entry)
                 else:
-                    recid_state_after_load = self._load_versions(
-                        entry,
-                    )
-                    if recid_state_after_load:
-                        self._save_original_dumped_record(
+                    with self._legacy_records(), self._record_transaction():
+                        recid_state_after_load = self._load_versions(
                             entry,
-                            recid_state_after_load,
                         )
-                        self._after_load_clc_sync(recid_state_after_load)
+                        if recid_state_after_load:
+                            self._save_original_dumped_record(
+                                entry,
+                                recid_state_after_load,
+                            )
+                            self._after_load_clc_sync(recid_state_after_load)
+                    self._record_loaded()
                 self.migration_logger.finalise_record(recid)
             except ManualImportRequired as e:
                 self.migration_logger.add_log(e, record=entry)
@@ -665,19 +993,171 @@ class CDSRecordServiceLoad(Load):
                 )
                 self.migration_logger.add_log(exc, record=entry)
 
+    def _flush_legacy_records(self):
+        """Insert the original dumps of the records pending in a batch."""
+        for legacy_recid, exc in self.legacy_records_writer.flush():
+            self.migration_logger.add_log(
+                f"Failed to save the original dump of {legacy_recid}: {str(exc)}",
+                record={"recid": legacy_recid},
+            )
+
+    def _flush(self):
+        """Commit and index the records pending in a batch."""
+        if self.batched_commits:
+            # commit the records loaded since the last batch, with their dumps
+            self._flush_legacy_records()
+            self.batched_commits.commit()
+        if self.deferred_indexing:
+            self.deferred_indexing.flush()
+
+    def _parallel_load(self, entries):
+        """Load the entries in a pool of worker processes.
+
+        The entries are partitioned by legacy recid, each partition being
+        loaded by its own worker. An entry holds all the versions of a legacy
+        record, so the records of a parent are never split across workers. In
+        dry runs, nothing is written and the workers share a single queue
+        instead, each validating the next entry when done with the previous
+        one. The logs of the workers are replayed on the loggers of the run.
+        """
+        loggers = {
+            "migration_logger": self.migration_logger,
+            "record_state_logger": self.record_state_logger,
+        }
+        mp_context = multiprocessing.get_context("spawn")
+        log_queue = mp_context.Queue()
+        log_listener = QueueListener(log_queue, LogRecordDispatcher())
+        log_listener.start()
+        results_queue = mp_context.Queue()
+        shared_queue = None
+        if self.dry_run:
+            shared_queue = mp_context.Queue(maxsize=self.workers * 4)
+        partitions = []
+        for _ in range(self.workers):
+            # the dump is read no faster than the workers load it: the reader
+            # waits once 4 entries per worker are pending
+            entries_queue = shared_queue
+            if shared_queue is None:
+                entries_queue = mp_context.Queue(maxsize=4)
+            process = mp_context.Process(
+                target=workers.run_worker,
+                args=(
+                    self._worker_kwargs,
+                    entries_queue,
+                    results_queue,
+                    log_queue,
+                    logging.getLogger().getEffectiveLevel(),
+                ),
+            )
+            process.start()
+            partitions.append((process, entries_queue))
+        running = self.workers
+
+        def handle_result(timeout=None):
+            nonlocal running
+            status, payload = results_queue.get(timeout=timeout)
+            if status == "error":
+                raise RuntimeError(f"Load worker failed:\n{payload}")
+            DeferredLogger.replay(payload, loggers)
+            if status == "done":
+                running -= 1
+
+        def handle_results():
+            try:
+                while True:
+                    handle_result(timeout=0)
+            except queue.Empty:
+                pass
+
+        def put(entries_queue, entry, process):
+            """Send an entry to a worker, as long as it is running."""
+            while True:
+                try:
+                    entries_queue.put(entry, timeout=1)
+                    return
+                except queue.Full:
+                    if shared_queue is not None:
+                        alive = any(p.is_alive() for p, _ in partitions)
+                    else:
+                        alive = process.is_alive()
+                    if not alive:
+                        raise RuntimeError("Load worker exited unexpectedly.")
+                finally:
+                    handle_results()
+
+        try:
+            for entry in entries:
+                if not entry:
+                    continue
+                partition = 0
+                if shared_queue is None:
+                    partition = load_partition(entry, self.workers)
+                process, entries_queue = partitions[partition]
+                put(entries_queue, entry, process)
+            for process, entries_queue in partitions:
+                put(entries_queue, None, process)
+            while running:
+                try:
+                    handle_result(timeout=5)
+                except queue.Empty:
+                    if not any(process.is_alive() for process, _ in partitions):
+                        raise RuntimeError("Load worker exited unexpectedly.")
+        except BaseException:
+            for process, _ in partitions:
+                process.terminate()
+            raise
+        finally:
+            for process, _ in partitions:
+                process.join()
+            log_listener.stop()
+
+    def _staged_files(self, entry):
+        """Source paths of the files of an entry to stage."""
+        recid = entry.get("record", {}).get("recid") if entry else None
+        if recid is None or self._should_skip_recid(recid):
+            return []
+        return [
+            str(legacy_file_path(file_data["eos_tmp_path"]))
+            for version in entry["versions"].values()
+            for file_data in version["files"].values()
+        ]
+
+    def _prefetch(self, entries):
+        """Stage the files of the next entries, if the files staging is set."""
+        if not self.files_staging:
+            return entries
+        return self.files_staging.prefetch(
+            entries, self.files_staging_lookahead, self._staged_files
+        )
+
+    def run(self, entries, cleanup=False):
+        """Load the entries, in parallel if ``workers`` is set."""
+        if not self.workers:
+            if not self.files_staging:
+                return super().run(entries, cleanup=cleanup)
+            with closing(self._prefetch(entries)) as entries:
+                return super().run(entries, cleanup=cleanup)
+        self._parallel_load(entries)
+        if cleanup:
+            self._cleanup()
+
     def _cleanup(self, *args, **kwargs):
         """Post migration process."""
-        for legacy_src_pid, legacy_dest_pid in self.legacy_pids_to_redirect.items():
-            if self._have_migrated_recid(legacy_src_pid):
-                continue
-            try:
-                parent_dest_pid = get_pid_by_legacy_recid(str(legacy_dest_pid))
-                assert str(parent_dest_pid.status) == "R"
-                legacy_recid_minter(legacy_src_pid, parent_dest_pid.object_uuid)
-                db.session.commit()
+        # the communities, groups and users may change before the next run
+        self._communities.clear()
+        self._valid_grants.clear()
+        self._valid_grant_subjects.clear()
+        if self.snapshot:
+            # offline dry run, no access to the database
+            return
+        self._flush()
+        redirects = mint_legacy_redirects(
+            self.legacy_pids_to_redirect, chunk_size=self.redirects_chunk_size
+        )
+        for legacy_src_pid, legacy_dest_pid, exc in redirects:
+            if exc is None:
                 self.migration_logger.finalise_record(legacy_src_pid)
-            except Exception as exc:
-                db.session.rollback()
+            else:
                 self.migration_logger.add_log(
                     f"Failed to redirect {legacy_src_pid} to {legacy_dest_pid}: {str(exc)}",
                     record={"recid": legacy_src_pid},
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration legacy redirections module."""
+
+from cds_rdm.minters import legacy_recid_minter
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+
+from cds_migrator_kit.rdm.records.lookups import chunked
+
+
+def _lrecid_pids(legacy_recids, chunk_size):
+    """Get the minted legacy recids PIDs, by legacy recid.
+
+    Only the columns are loaded, so they are not expired by the commits.
+    """
+    pids = {}
+    for chunk in chunked(legacy_recids, chunk_size):
+        query = PersistentIdentifier.query.filter(
+            PersistentIdentifier.pid_type == "lrecid",
+            PersistentIdentifier.pid_value.in_(chunk),
+        ).with_entities(
+            PersistentIdentifier.pid_value,
+            PersistentIdentifier.object_type,
+            PersistentIdentifier.object_uuid,
+            PersistentIdentifier.status,
+        )
+        pids.update((pid.pid_value, pid) for pid in query)
+    return pids
+
+
+def _mint_one(legacy_src_pid, dest_pid):
+    """Mint a redirection in its own transaction."""
+    try:
+        legacy_recid_minter(legacy_src_pid, dest_pid.object_uuid)
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        return exc
+
+
+def mint_legacy_redirects(redirects, chunk_size=1000):
+    """Mint the legacy recids redirected to the parent of another legacy recid.
+
+    The destinations and the already minted sources are resolved in bulk, and
+    the new PIDs are inserted in one transaction per chunk. A failing chunk is
+    minted again one PID at a time, to isolate the failing redirections.
+
+    Yields the source and destination legacy recids of each redirection with
+    the error minting it, if any. The redirections already minted are skipped.
+    """
+    redirects = {str(src): str(dest) for src, dest in redirects.items()}
+    minted = _lrecid_pids(redirects.keys(), chunk_size)
+    pending = [(src, dest) for src, dest in redirects.items() if src not in minted]
+    dest_pids = _lrecid_pids({dest for _, dest in pending}, chunk_size)
+
+    for chunk in chunked(pending, chunk_size):
+        errors = {}
+        to_mint = []
+        for src, dest in chunk:
+            dest_pid = dest_pids.get(dest)
+            if dest_pid is None:
+                errors[src] = ValueError(f"Legacy recid {dest} is not migrated.")
+            elif dest_pid.status != PIDStatus.REGISTERED:
+                errors[src] = ValueError(f"Legacy recid {dest} is not registered.")
+            else:
+                to_mint.append((src, dest_pid))
+        try:
+            # same as the legacy recid minter, in one multi-row insert
+            db.session.add_all(
+                PersistentIdentifier(
+                    pid_type="lrecid",
+                    pid_value=src,
+                    object_type=dest_pid.object_type,
+                    object_uuid=dest_pid.object_uuid,
+                    status=PIDStatus.REGISTERED,
+                )
+                for src, dest_pid in to_mint
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            for src, dest_pid in to_mint:
+                error = _mint_one(src, dest_pid)
+                if error:
+                    errors[src] = error
+        for src, dest in chunk:
+            yield src, dest, errors.get(src)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration load files staging module."""
+
+import hashlib
+import os
+import shutil
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class FilesStaging:
+    """Copy the files of the upcoming records to a local staging directory.
+
+    The files are copied in a thread pool while the previous records are
+    loaded, and read from their staged copy when loaded. A staged copy is
+    deleted once all the files loaded from it are committed. The staged copies
+    are evicted, least recently used first, above ``max_size`` bytes; the
+    files which are not staged are read from their source.
+    """
+
+    def __init__(self, staging_dir, max_size, workers=4):
+        """Constructor."""
+        self.staging_dir = Path(staging_dir)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        # copies by source, number of files to load from them, staged sizes
+        self._staged = {}
+        self._refs = Counter()
+        self._sizes = OrderedDict()
+        self._size = 0
+
+    def _target(self, source):
+        key = hashlib.sha256(source.encode()).hexdigest()
+        return self.staging_dir / key[:2] / key
+
+    def _remove(self, source):
+        """Remove a staged copy, with the lock held."""
+        self._staged.pop(source, None)
+        size = self._sizes.pop(source, None)
+        if size is not None:
+            self._size -= size
+            self._target(source).unlink(missing_ok=True)
+
+    def _copy(self, source):
+        """Copy a file to the staging directory, evicting the oldest copies."""
+        target = self._target(source)
+        target.parent.mkdir(exist_ok=True)
+        tmp_target = target.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            shutil.copyfile(source, tmp_target)
+            os.replace(tmp_target, target)
+        except Exception:
+            tmp_target.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if source not in self._staged:
+                # released meanwhile
+                target.unlink(missing_ok=True)
+                return
+            self._sizes[source] = target.stat().st_size
+            self._size += self._sizes[source]
+            while self._size > self.max_size:
+                self._remove(next(iter(self._sizes)))
+
+    def stage(self, sources):
+        """Start copying the files to load, by source path."""
+        with self._lock:
+            for source in sources:
+                self._refs[source] += 1
+                if source not in self._staged:
+                    self._staged[source] = self._executor.submit(self._copy, source)
+
+    def open(self, source):
+        """Open a file to load, from its staged copy if any."""
+        with self._lock:
+            future = self._staged.get(source)
+        if future is not None:
+            try:
+                future.result()
+                with self._lock:
+                    if source in self._sizes:
+                        self._sizes.move_to_end(source)
+                        return open(self._target(source), "rb")
+            except Exception:
+                # failed to stage, read from the source instead
+                pass
+        return open(source, "rb")
+
+    def release(self, source):
+        """Release a loaded file, deleting its staged copy if no longer needed."""
+        with self._lock:
+            self._refs[source] -= 1
+            if self._refs[source] <= 0:
+                del self._refs[source]
+                self._remove(source)
+
+    def prefetch(self, entries, lookahead, sources):
+        """Iterate over the entries, staging the files of the next ones.
+
+        The files of each entry, given by ``sources``, are staged when it
+        enters the window of the next ``lookahead`` entries. The staging is
+        closed at the end of the entries.
+        """
+        window = deque()
+        try:
+            for entry in entries:
+                self.stage(sources(entry))
+                window.append(entry)
+                if len(window) > lookahead:
+                    yield window.popleft()
+            while window:
+                yield window.popleft()
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop staging, and remove the remaining staged copies."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            for source in list(self._staged):
+                self._remove(source)
+            self._refs.clear()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration load transactions module."""
+
+import time
+from contextlib import contextmanager
+
+from flask_sqlalchemy.session import Session
+from invenio_db import db
+
+
+class BatchedSession(Session):
+    """Database session of a load committing its records in batches.
+
+    While a record is loaded in its ``record_savepoint``, the commits done by
+    the load and by the services only release the savepoint of the unit of
+    work committing, if any, or flush the session, and the rollbacks only roll
+    back the savepoint of the record. Otherwise, it commits and rolls back as
+    any session.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super().__init__(*args, **kwargs)
+        self.record_savepoint = None
+
+    def commit(self):
+        """Commit, or release the savepoint committing while loading a record."""
+        if self.record_savepoint is None:
+            return super().commit()
+        nested = self.get_nested_transaction()
+        if nested is not None and nested is not self.record_savepoint:
+            nested.commit()
+        else:
+            self.flush()
+
+    def rollback(self):
+        """Roll back, or roll back the savepoint of the record being loaded."""
+        if self.record_savepoint is None:
+            return super().rollback()
+        if self.record_savepoint.is_active:
+            self.record_savepoint.rollback()
+        # keep isolating the rest of the record from the previous ones
+        self.record_savepoint = self.begin_nested()
+
+
+class BatchedCommits:
+    """Commit the loaded records in batches, with a savepoint per record.
+
+    The records are loaded with a :class:`BatchedSession`, the database
+    session of the application context of the load only. The transaction is
+    only committed on :meth:`commit`, due every ``batch_size`` records or
+    ``batch_interval`` seconds, whichever comes first.
+    """
+
+    def __init__(self, batch_size=None, batch_interval=None):
+        """Constructor."""
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._records = 0
+        self._started = time.monotonic()
+
+    @staticmethod
+    def _session():
+        """Get the session of the load, replaced by a batched one if needed.
+
+        The sessions are scoped by application context, so the sessions of
+        other threads are left untouched.
+        """
+        session = db.session()
+        if not isinstance(session, BatchedSession):
+            db.session.remove()
+            session = BatchedSession(**db.session.session_factory.kw)
+            db.session.registry.set(session)
+        return session
+
+    def is_due(self):
+        """Whether the records loaded since the last commit are to be committed."""
+        if self.batch_size and self._records >= self.batch_size:
+            return True
+        if self.batch_interval:
+            return time.monotonic() - self._started >= self.batch_interval
+        return False
+
+    @contextmanager
+    def record(self):
+        """Load a record in a savepoint, rolled back if the record fails."""
+        session = self._session()
+        session.record_savepoint = session.begin_nested()
+        try:
+            yield
+        except Exception:
+            if session.record_savepoint.is_active:
+                session.record_savepoint.rollback()
+            raise
+        else:
+            if session.record_savepoint.is_active:
+                session.record_savepoint.commit()
+        finally:
+            session.record_savepoint = None
+        self._records += 1
+
+    def commit(self):
+        """Commit the records loaded since the last commit."""
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        self._records = 0
+        self._started = time.monotonic()
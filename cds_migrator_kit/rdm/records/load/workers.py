@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM load worker processes module.
+
+Each worker process creates its own application and database connection, and
+loads the entries of its partition sent by the parent process.
+"""
+
+import logging
+import traceback
+from logging.handlers import QueueHandler
+
+from invenio_app.factory import create_app
+from invenio_db import db
+
+from cds_migrator_kit.reports.log import DeferredLogger
+
+
+def run_worker(load_kwargs, entries_queue, results_queue, log_queue, log_level):
+    """Load the entries received on ``entries_queue`` until a None entry.
+
+    The logs events of each entry are sent on ``results_queue``, followed by
+    a last message once the pending commits and indexing of the worker are
+    flushed, or by the traceback of an unexpected error.
+    """
+    # avoid circular import
+    from cds_migrator_kit.rdm.records.load.load import CDSRecordServiceLoad
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+
+    events = []
+    try:
+        with create_app().app_context():
+            load = CDSRecordServiceLoad(
+                **load_kwargs,
+                migration_logger=DeferredLogger("migration_logger", events),
+                record_state_logger=DeferredLogger("record_state_logger", events),
+            )
+            for entry in load._prefetch(iter(entries_queue.get, None)):
+                load._load(entry)
+                results_queue.put(("loaded", list(events)))
+                events.clear()
+            load._flush()
+            db.session.remove()
+        results_queue.put(("done", list(events)))
+    except Exception:
+        results_queue.put(("error", traceback.format_exc()))
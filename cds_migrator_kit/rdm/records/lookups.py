@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration lookups module.
+
+Run-wide caches of the database and search lookups needed while migrating
+records.
+"""
+
+from itertools import islice
+
+from cds_rdm.legacy.models import CDSMigrationAffiliationMapping
+from invenio_access.permissions import system_identity
+from invenio_accounts.models import UserIdentity
+from invenio_db import db
+from invenio_records_resources.proxies import current_service_registry
+from invenio_vocabularies.contrib.names.models import NamesMetadata
+from opensearchpy import RequestError
+from sqlalchemy import update
+
+from cds_migrator_kit.errors import UnexpectedValue
+
+IN_QUERY_CHUNK_SIZE = 1000
+"""Number of values of each ``IN`` query on a large set of values."""
+
+
+def chunked(values, size=IN_QUERY_CHUNK_SIZE):
+    """Split values in lists of at most ``size`` values."""
+    values = iter(values)
+    while chunk := list(islice(values, size)):
+        yield chunk
+
+
+def search_vocabulary(term, vocab_type):
+    """Search vocabulary utility function."""
+    service = current_service_registry.get("vocabularies")
+    if "/" in term:
+        # escape the slashes
+        term = f'"{term}"'
+    try:
+        vocabulary_result = service.search(
+            system_identity, type=vocab_type, q=f'"{term}"'
+        ).to_dict()
+        return vocabulary_result
+    except RequestError:
+        raise UnexpectedValue(
+            subfield="a",
+            value=term,
+            field=vocab_type,
+            message=f"Vocabulary {vocab_type} term {term} not valid search phrase.",
+            stage="vocabulary match",
+        )
+
+
+class VocabulariesLookup:
+    """Cache the vocabularies searches done during the run.
+
+    Only the total and the best hit of each search are kept. If a lookups
+    snapshot is given, the terms are searched in it instead.
+    """
+
+    def __init__(self, snapshot=None):
+        """Constructor."""
+        self._results = {}
+        self._snapshot = snapshot
+
+    def search(self, term, vocab_type):
+        """Search a term in a vocabulary."""
+        key = (vocab_type, term)
+        if key not in self._results:
+            if self._snapshot:
+                hits = self._snapshot.search_vocabulary(term, vocab_type)["hits"]
+            else:
+                hits = search_vocabulary(term, vocab_type)["hits"]
+            self._results[key] = {
+                "hits": {"total": hits["total"], "hits": hits["hits"][:1]}
+            }
+        return self._results[key]
+
+
+class AffiliationsLookup:
+    """Resolve legacy affiliations against the affiliations mapping table.
+
+    Each entry is a dict with the curated affiliation and the ROR matches of
+    the legacy input, or None if the input is not in the mapping. If a lookups
+    snapshot is given, the mapping is read from it instead.
+    """
+
+    def __init__(self, snapshot=None):
+        """Constructor."""
+        self._affiliations = {}
+        self._snapshot = snapshot
+        self._warm = False
+
+    def _to_dict(self, match):
+        """Extract the mapping values used by the transform."""
+        return {
+            "curated_affiliation": match.curated_affiliation,
+            "ror_exact_match": match.ror_exact_match,
+            "ror_not_exact_match": match.ror_not_exact_match,
+        }
+
+    def _fetch(self, affiliation_names=None):
+        """Fetch the mapping of legacy affiliations, or all of it if None."""
+        if self._snapshot:
+            return self._snapshot.affiliations(affiliation_names)
+        matches = CDSMigrationAffiliationMapping.query
+        if affiliation_names is not None:
+            matches = matches.filter(
+                CDSMigrationAffiliationMapping.legacy_affiliation_input.in_(
+                    affiliation_names
+                )
+            )
+        return {
+            match.legacy_affiliation_input: self._to_dict(match) for match in matches
+        }
+
+    def warm(self):
+        """Preload the whole affiliations mapping."""
+        self._affiliations.update(self._fetch())
+        self._warm = True
+
+    def get(self, affiliation_name):
+        """Get the mapping of a legacy affiliation."""
+        if affiliation_name not in self._affiliations:
+            mapping = None
+            if not self._warm:
+                mapping = self._fetch([affiliation_name]).get(affiliation_name)
+            self._affiliations[affiliation_name] = mapping
+        return self._affiliations[affiliation_name]
+
+    def items(self):
+        """Iterate over the resolved affiliations found in the mapping."""
+        for affiliation_name, mapping in self._affiliations.items():
+            if mapping is not None:
+                yield affiliation_name, mapping
+
+
+class NamesLookup:
+    """Resolve CERN person ids to names vocabulary entries.
+
+    Resolved entries are kept for the whole run, including the person ids
+    without a matching entry, so that each person id is queried at most once.
+    Each entry is a dict with the ``id`` and the ``json`` of the names entry,
+    shared between all the person ids of the same user.
+
+    Identifiers found during the migration are merged into the cached entries
+    and queued, to be written in bulk with :meth:`flush`. If a lookups snapshot
+    is given, the entries are read from it instead and never written.
+    """
+
+    def __init__(self, snapshot=None):
+        """Constructor."""
+        self._names = {}
+        self._entries = {}
+        self._pending = set()
+        self._snapshot = snapshot
+        self._warm = False
+
+    def _fetch(self, person_ids=None):
+        """Fetch names entries for person ids, or for all of them if None."""
+        if self._snapshot:
+            return {
+                person_id: self._entries.setdefault(
+                    name_id, {"id": name_id, "json": json}
+                )
+                for person_id, (name_id, json) in self._snapshot.names(
+                    person_ids
+                ).items()
+            }
+
+        query = db.session.query(UserIdentity.id, UserIdentity.id_user)
+        if person_ids is None:
+            identities = [query]
+        else:
+            identities = (
+                query.filter(UserIdentity.id.in_(chunk))
+                for chunk in chunked(person_ids)
+            )
+        user_ids = {}
+        for query in identities:
+            for person_id, user_id in query:
+                user_ids.setdefault(person_id, str(user_id))
+        if not user_ids:
+            return {}
+
+        names_by_user = {}
+        for chunk in chunked(sorted(set(user_ids.values()))):
+            names = NamesMetadata.query.filter(NamesMetadata.internal_id.in_(chunk))
+            for name in names:
+                if "unlisted" in name.json.get("tags", []):
+                    continue
+                # keep the first listed entry of the user
+                if name.internal_id not in names_by_user:
+                    names_by_user[name.internal_id] = self._entries.setdefault(
+                        str(name.id), {"id": str(name.id), "json": name.json}
+                    )
+
+        return {
+            person_id: names_by_user[user_id]
+            for person_id, user_id in user_ids.items()
+            if user_id in names_by_user
+        }
+
+    def warm(self):
+        """Preload the names entries of all known person ids."""
+        self._names.update(self._fetch())
+        self._warm = True
+
+    def resolve(self, person_ids):
+        """Resolve, with one query per table, the person ids not looked up yet."""
+        missing = {str(pid) for pid in person_ids if str(pid) not in self._names}
+        if not missing:
+            return
+        resolved = {} if self._warm else self._fetch(missing)
+        for person_id in missing:
+            self._names[person_id] = resolved.get(person_id)
+
+    def get(self, person_id):
+        """Get the names entry of a person id, resolving it if needed."""
+        person_id = str(person_id)
+        if person_id not in self._names:
+            self.resolve([person_id])
+        return self._names[person_id]
+
+    def items(self):
+        """Iterate over the resolved person ids with a names entry."""
+        for person_id, entry in self._names.items():
+            if entry is not None:
+                yield person_id, entry
+
+    def merge_identifiers(self, name_id, identifiers):
+        """Add the missing identifiers to a names entry.
+
+        The merge is applied to the cached entry straight away and written to
+        the database on the next :meth:`flush`.
+        """
+        entry = self._entries[name_id]
+        existing_ids = entry["json"].get("identifiers", [])
+        missing_ids = []
+        for identifier in identifiers:
+            if identifier not in existing_ids and identifier not in missing_ids:
+                missing_ids.append(identifier)
+        if missing_ids:
+            # assign a new json object due to how postgres json assignment is handled
+            entry["json"] = {**entry["json"], "identifiers": existing_ids + missing_ids}
+            self._pending.add(name_id)
+
+    def flush(self, chunk_size=500):
+        """Write the pending identifiers merges, one transaction per chunk."""
+        if self._snapshot:
+            # the snapshot is read-only, the merges are only kept in memory
+            self._pending.clear()
+            return
+        for chunk in chunked(sorted(self._pending), chunk_size):
+            # in its own transaction, not to commit or roll back the session
+            with db.engine.begin() as connection:
+                for name_id in chunk:
+                    connection.execute(
+                        update(NamesMetadata)
+                        .where(NamesMetadata.id == name_id)
+                        .values(
+                            json=self._entries[name_id]["json"],
+                            version_id=NamesMetadata.version_id + 1,
+                        )
+                    )
+            self._pending.difference_update(chunk)
+
+    def pop_pending(self):
+        """Return and clear the pending merges, to apply them in another lookup."""
+        pending = {name_id: self._entries[name_id]["json"] for name_id in self._pending}
+        self._pending.clear()
+        return pending
+
+    def merge_pending(self, pending):
+        """Merge the pending merges returned by another lookup."""
+        for name_id, json in pending.items():
+            if name_id in self._entries:
+                self.merge_identifiers(name_id, json.get("identifiers", []))
+            else:
+                self._entries[name_id] = {"id": name_id, "json": json}
+                self._pending.add(name_id)
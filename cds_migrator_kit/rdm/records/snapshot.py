@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM migration lookups snapshot module.
+
+A snapshot is a SQLite file with everything the records transform looks up in
+the database and in the search cluster, to transform records without them.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier
+from invenio_records_resources.proxies import current_service_registry
+
+from cds_migrator_kit.rdm.records.lookups import (
+    AffiliationsLookup,
+    NamesLookup,
+    chunked,
+)
+from cds_migrator_kit.users.lookups import UsersLookup
+
+SNAPSHOT_VERSION = 1
+"""Version of the snapshot format, bumped on every incompatible change."""
+
+VOCABULARY_TYPES = ["experiments", "programmes", "departments", "accelerators", "beams"]
+"""Vocabularies searched by the records transform."""
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE users (email TEXT PRIMARY KEY, user_id INTEGER);
+CREATE TABLE names (person_id TEXT PRIMARY KEY, name_id TEXT);
+CREATE TABLE names_entries (name_id TEXT PRIMARY KEY, json TEXT);
+CREATE TABLE affiliations (legacy_input TEXT PRIMARY KEY, json TEXT);
+CREATE TABLE vocabularies (type TEXT, term TEXT, id TEXT, position INTEGER);
+CREATE INDEX vocabularies_term ON vocabularies (type, term);
+CREATE TABLE legacy_recids (recid TEXT PRIMARY KEY, status TEXT);
+"""
+
+IN_QUERY_CHUNK_SIZE = 500
+"""Number of values of each ``IN`` query, below the SQLite variables limit."""
+
+
+def _vocabulary_terms(hit):
+    """Terms matching a vocabulary entry: its id and its titles."""
+    terms = {hit["id"]}
+    terms.update(hit.get("title", {}).values())
+    return {term.strip().lower() for term in terms}
+
+
+def _vocabulary_hits(vocab_type, page_size=1000):
+    """Iterate over all the entries of a vocabulary."""
+    service = current_service_registry.get("vocabularies")
+    page = 1
+    while True:
+        hits = service.search(
+            system_identity, type=vocab_type, page=page, size=page_size
+        ).to_dict()["hits"]["hits"]
+        yield from hits
+        if len(hits) < page_size:
+            return
+        page += 1
+
+
+def export_snapshot(filepath, vocabulary_types=VOCABULARY_TYPES):
+    """Export the lookups of the records transform to a snapshot file."""
+    tmp_filepath = f"{filepath}.tmp"
+    if os.path.exists(tmp_filepath):
+        os.remove(tmp_filepath)
+    conn = sqlite3.connect(tmp_filepath)
+    with conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("version", str(SNAPSHOT_VERSION)),
+                ("created", datetime.utcnow().isoformat()),
+            ],
+        )
+
+        users = UsersLookup()
+        users.warm()
+        conn.executemany("INSERT INTO users VALUES (?, ?)", users.items())
+
+        names = NamesLookup()
+        names.warm()
+        entries = {}
+        for person_id, entry in names.items():
+            entries[entry["id"]] = entry["json"]
+            conn.execute("INSERT INTO names VALUES (?, ?)", (person_id, entry["id"]))
+        conn.executemany(
+            "INSERT INTO names_entries VALUES (?, ?)",
+            ((name_id, json.dumps(data)) for name_id, data in entries.items()),
+        )
+
+        affiliations = AffiliationsLookup()
+        affiliations.warm()
+        conn.executemany(
+            "INSERT INTO affiliations VALUES (?, ?)",
+            ((name, json.dumps(mapping)) for name, mapping in affiliations.items()),
+        )
+
+        for vocab_type in vocabulary_types:
+            for position, hit in enumerate(_vocabulary_hits(vocab_type)):
+                conn.executemany(
+                    "INSERT INTO vocabularies VALUES (?, ?, ?, ?)",
+                    (
+                        (vocab_type, term, hit["id"], position)
+                        for term in _vocabulary_terms(hit)
+                    ),
+                )
+
+        legacy_recids = db.session.query(
+            PersistentIdentifier.pid_value, PersistentIdentifier.status
+        ).filter_by(pid_type="lrecid")
+        conn.executemany(
+            "INSERT OR REPLACE INTO legacy_recids VALUES (?, ?)",
+            ((recid, status.value) for recid, status in legacy_recids),
+        )
+    conn.close()
+    os.replace(tmp_filepath, filepath)
+
+
+class LookupsSnapshot:
+    """Read-only access to a lookups snapshot file."""
+
+    def __init__(self, filepath):
+        """Constructor."""
+        self.filepath = filepath
+        # read-only, also read by the producer thread of a pipelined run
+        self._conn = sqlite3.connect(
+            f"file:{filepath}?mode=ro", uri=True, check_same_thread=False
+        )
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if meta["version"] != str(SNAPSHOT_VERSION):
+            raise ValueError(
+                f"Lookups snapshot {filepath} has version {meta['version']}, "
+                f"expected {SNAPSHOT_VERSION}. Export it again."
+            )
+        self.version = meta["version"]
+        self.created = meta["created"]
+
+    def _select(self, query, column, values):
+        """Run a query, filtered by the values of a column if not None."""
+        if values is None:
+            return self._conn.execute(query).fetchall()
+        rows = []
+        for chunk in chunked(values, IN_QUERY_CHUNK_SIZE):
+            placeholders = ", ".join("?" * len(chunk))
+            rows.extend(
+                self._conn.execute(f"{query} WHERE {column} IN ({placeholders})", chunk)
+            )
+        return rows
+
+    def users(self, emails=None):
+        """Get the user ids of the emails, or of all the users if None."""
+        return dict(self._select("SELECT email, user_id FROM users", "email", emails))
+
+    def names(self, person_ids=None):
+        """Get the names entries of the person ids, or of all if None."""
+        return {
+            person_id: (name_id, json.loads(data))
+            for person_id, name_id, data in self._select(
+                "SELECT person_id, names.name_id, json FROM names "
+                "JOIN names_entries ON names.name_id = names_entries.name_id",
+                "person_id",
+                person_ids,
+            )
+        }
+
+    def affiliations(self, affiliation_names=None):
+        """Get the mapping of the legacy affiliations, or all of it if None."""
+        return {
+            name: json.loads(data)
+            for name, data in self._select(
+                "SELECT legacy_input, json FROM affiliations",
+                "legacy_input",
+                affiliation_names,
+            )
+        }
+
+    def search_vocabulary(self, term, vocab_type):
+        """Search a term in a vocabulary, matching the ids and titles exactly.
+
+        Returns the same structure as the vocabularies service search, with
+        the matching entries ids only.
+        """
+        ids = [
+            vocab_id
+            for (vocab_id,) in self._conn.execute(
+                "SELECT DISTINCT id FROM vocabularies WHERE type = ? AND term = ? "
+                "ORDER BY position",
+                (vocab_type, term.strip().lower()),
+            )
+        ]
+        return {"hits": {"total": len(ids), "hits": [{"id": i} for i in ids]}}
+
+    def legacy_recid_status(self, recid):
+        """Get the status of the legacy recid PID, or None if not minted."""
+        row = self._conn.execute(
+            "SELECT status FROM legacy_recids WHERE recid = ?", (str(recid),)
+        ).fetchone()
+        return row and row[0]
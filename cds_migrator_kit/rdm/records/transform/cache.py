@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM transform results cache module."""
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+import cds_migrator_kit
+
+CACHE_FORMAT = 1
+"""Version of the cache entries format, bumped on every incompatible change."""
+
+
+def rules_fingerprint():
+    """Hash the source of the package, transform models and rules included."""
+    digest = hashlib.sha256()
+    package_dir = Path(cds_migrator_kit.__file__).parent
+    for path in sorted(package_dir.rglob("*.py")):
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class TransformResultCache:
+    """Content-addressed cache of the transformed entries.
+
+    Entries are keyed by a hash of the legacy entry, the transform rules, the
+    transform options and the lookups snapshot, so any change to one of them
+    misses the cache. Each cache entry is a pickle file with the transform
+    result and the logs events of the entry.
+    """
+
+    def __init__(self, cache_dir, snapshot, options):
+        """Constructor."""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        digest.update(str(CACHE_FORMAT).encode())
+        digest.update(rules_fingerprint().encode())
+        digest.update(f"{snapshot.version}-{snapshot.created}".encode())
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        self._salt = digest.digest()
+
+    def key(self, entry):
+        """Compute the cache key of a legacy entry."""
+        digest = hashlib.sha256(self._salt)
+        digest.update(json.dumps(entry, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.pickle"
+
+    def get(self, key):
+        """Get the cached result and logs events, or None if not cached."""
+        try:
+            with open(self._path(key), "rb") as fp:
+                return pickle.load(fp)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, result, events):
+        """Store the result and logs events of an entry."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as fp:
+            pickle.dump((result, events), fp, protocol=pickle.HIGHEST_PROTOCOL)
+        # atomic, the workers can share the cache directory
+        os.replace(tmp_path, path)
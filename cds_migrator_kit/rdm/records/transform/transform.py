@@ -8,27 +8,23 @@
 """CDS-RDM transform step module."""
 import datetime
 import logging
-from collections import OrderedDict
-from copy import deepcopy
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from logging.handlers import QueueListener
 from pathlib import Path
 
 from dateutil.parser import ParserError, parse
 import arrow
-from cds_rdm.legacy.models import CDSMigrationAffiliationMapping
+from flask import current_app
 from idutils import normalize_ror
 from idutils.validators import is_doi, is_ror
-from invenio_access.permissions import system_identity
-from invenio_accounts.models import User, UserIdentity
-from invenio_db import db
 from invenio_pidstore.models import PersistentIdentifier, PIDStatus
 from invenio_rdm_migrator.streams.records.transform import (
     RDMRecordEntry,
     RDMRecordTransform,
 )
-from invenio_records_resources.proxies import current_service_registry
-from invenio_vocabularies.contrib.names.models import NamesMetadata
-from opensearchpy import RequestError
-from sqlalchemy.exc import NoResultFound
 
 from cds_migrator_kit.errors import (
     ManualImportRequired,
@@ -41,6 +37,16 @@ from cds_migrator_kit.rdm.migration_config import (
     RDM_RECORDS_IDENTIFIERS_SCHEMES,
     VOCABULARIES_NAMES_SCHEMES,
 )
+from cds_migrator_kit.rdm.records.access import is_supported_file_status
+from cds_migrator_kit.rdm.records.dumps import OriginalDumpsStore
+from cds_migrator_kit.rdm.records.lookups import (
+    AffiliationsLookup,
+    NamesLookup,
+    VocabulariesLookup,
+)
+from cds_migrator_kit.rdm.records.snapshot import LookupsSnapshot
+from cds_migrator_kit.rdm.records.transform import workers
+from cds_migrator_kit.rdm.records.transform.cache import TransformResultCache
 from cds_migrator_kit.rdm.records.transform.config import (
     FILE_SUBFORMATS_TO_DROP,
     IDENTIFIERS_SCHEMES_TO_DROP,
@@ -48,34 +54,20 @@ from cds_migrator_kit.rdm.records.transform.config import (
     PIDS_SCHEMES_ALLOWED,
     PIDS_SCHEMES_TO_DROP,
 )
-from cds_migrator_kit.reports.log import MigrationProgressLogger, RecordStateLogger
+from cds_migrator_kit.reports.log import (
+    DeferredLogger,
+    LogRecordDispatcher,
+    MigrationProgressLogger,
+    RecordStateLogger,
+)
 from cds_migrator_kit.transform.dumper import CDSRecordDump
 from cds_migrator_kit.transform.errors import LossyConversion
+from cds_migrator_kit.transform.overdo import copy_json
+from cds_migrator_kit.users.lookups import UsersLookup
 
 cli_logger = logging.getLogger("migrator")
 
 
-def search_vocabulary(term, vocab_type):
-    """Search vocabulary utility function."""
-    service = current_service_registry.get("vocabularies")
-    if "/" in term:
-        # escape the slashes
-        term = f'"{term}"'
-    try:
-        vocabulary_result = service.search(
-            system_identity, type=vocab_type, q=f'"{term}"'
-        ).to_dict()
-        return vocabulary_result
-    except RequestError:
-        raise UnexpectedValue(
-            subfield="a",
-            value=term,
-            field=vocab_type,
-            message=f"Vocabulary {vocab_type} term {term} not valid search phrase.",
-            stage="vocabulary match",
-        )
-
-
 class CDSToRDMRecordEntry(RDMRecordEntry):
     """Transform CDS record to RDM record."""
 
@@ -85,6 +77,9 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
         missing_users_dir=None,
         missing_users_filename="people.csv",
         affiliations_mapping=None,
+        names_lookup=None,
+        users_lookup=None,
+        vocabularies_lookup=None,
         dry_run=False,
         collection=None,
         restricted=False,
@@ -94,7 +89,10 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
         """Constructor."""
         self.missing_users_dir = missing_users_dir
         self.missing_users_filename = missing_users_filename
-        self.affiliations_mapping = affiliations_mapping
+        self.affiliations_mapping = affiliations_mapping or AffiliationsLookup()
+        self.names_lookup = names_lookup or NamesLookup()
+        self.users_lookup = users_lookup or UsersLookup()
+        self.vocabularies_lookup = vocabularies_lookup or VocabulariesLookup()
         self.dry_run = dry_run
         self.collection = collection
         self.restricted = restricted
@@ -152,7 +150,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
         DATACITE_PREFIX = current_app.config["DATACITE_PREFIX"]
 
         pids = json_entry.get("_pids", {})
-        output_pids = deepcopy(pids)
+        output_pids = dict(pids)
         for key, identifier in pids.items():
             # ignoring some pids
             if key.upper() in PIDS_SCHEMES_TO_DROP:
@@ -171,7 +169,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 # assume it is DOI
                 key = "DOI"
             if key.upper() == "DOI":
-                doi_identifier = deepcopy(identifier)
+                doi_identifier = dict(identifier)
                 doi = identifier["identifier"]
 
                 if doi.startswith(DATACITE_PREFIX):
@@ -201,10 +199,8 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
         email = json_entry.get("submitter")
         if not email:
             return "system"
-        try:
-            user = User.query.filter_by(email=email).one()
-            return user.id
-        except NoResultFound:
+        user_id = self.users_lookup.get(email)
+        if user_id is None:
             return UnexpectedValue(
                 message=f"{email} not found - did you run user migration?",
                 stage="transform",
@@ -212,25 +208,24 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 value=email,
                 priority="critical",
             )
+        return user_id
 
     def _match_affiliation(self, affiliation_name):
         """Match an affiliation against `CDSMigrationAffiliationMapping` db table."""
         if is_ror(affiliation_name):
             return {"id": normalize_ror(affiliation_name)}
         # Step 1: search in the affiliation mapping (ROR organizations)
-        match = self.affiliations_mapping.query.filter_by(
-            legacy_affiliation_input=affiliation_name
-        ).one_or_none()
+        match = self.affiliations_mapping.get(affiliation_name)
         if match:
             # Step 1: check if there is a curated input
-            if match.curated_affiliation:
-                return match.curated_affiliation
+            if match["curated_affiliation"]:
+                return match["curated_affiliation"]
             # Step 2: check if there is an exact match
-            elif match.ror_exact_match:
-                return {"id": normalize_ror(match.ror_exact_match)}
+            elif match["ror_exact_match"]:
+                return {"id": normalize_ror(match["ror_exact_match"])}
             # Step 3: check if there is not exact match
-            elif match.ror_not_exact_match:
-                _affiliation_ror_id = normalize_ror(match.ror_not_exact_match)
+            elif match["ror_not_exact_match"]:
+                _affiliation_ror_id = normalize_ror(match["ror_not_exact_match"])
                 raise RecordFlaggedCuration(
                     subfield="u",
                     value={"id": _affiliation_ror_id},
@@ -290,8 +285,8 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 inner_dict.pop("identifiers", None)
 
         def lookup_person_id(creator):
-            migrated_identifiers = deepcopy(
-                creator.get("person_or_org", {}).get("identifiers", [])
+            migrated_identifiers = creator.get("person_or_org", {}).get(
+                "identifiers", []
             )
             name = None
             # lookup person_id
@@ -304,20 +299,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 {},
             ).get("identifier")
             if person_id:
-                ui = UserIdentity.query.filter_by(id=person_id).one_or_none()
-                if ui:
-                    user_id = ui.user.id
-                    names = NamesMetadata.query.filter_by(
-                        internal_id=str(user_id)
-                    ).all()
-                    name = next(
-                        (
-                            name
-                            for name in names
-                            if "unlisted" not in name.json.get("tags", [])
-                        ),
-                        None,
-                    )
+                name = self.names_lookup.get(person_id)
             # filter out cern person_id
             creator["person_or_org"]["identifiers"] = [
                 identifier
@@ -328,34 +310,40 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 # update identifiers of the authors to the latest known
                 ids = creator["person_or_org"]["identifiers"]
                 # check ids supplied by the names vocabulary and add missing
-                for identifier in name.json.get("identifiers", []):
+                for identifier in name["json"].get("identifiers", []):
                     if identifier not in ids and identifier.get("scheme") != "cern":
                         ids.append(identifier)
 
-                # copy names identifiers and json to assign explicitly json object
-                # due to how postgres assignment of json is handled
-                json_copy = deepcopy(name.json)
-                existing_ids = deepcopy(name.json.get("identifiers", []))
                 # update the names vocab to contain other ids found during migration
-                for identifier in ids:
-                    if identifier not in existing_ids:
-                        existing_ids.append(identifier)
-
-                if existing_ids:
-                    # assign json explicitly to names entry
-                    json_copy["identifiers"] = existing_ids
-                    name.json = json_copy
-
-                    db.session.add(name)
-                    db.session.commit()
+                self.names_lookup.merge_identifiers(name["id"], ids)
+
+        def resolve_person_ids(json):
+            # resolve the person ids of all the authors of the record at once
+            person_ids = [
+                identifier["identifier"]
+                for key in ("creators", "contributors")
+                for creator in json.get(key) or []
+                if creator
+                for identifier in creator.get("person_or_org", {}).get(
+                    "identifiers", []
+                )
+                if identifier["scheme"] == "cern"
+            ]
+            if person_ids:
+                self.names_lookup.resolve(person_ids)
 
         def creators(json, key="creators"):
-            _creators = deepcopy(json.get(key, []))
-            _creators = list(filter(lambda x: x is not None, _creators))
-            for creator in _creators:
+            # copied with their affiliations and identifiers, the record
+            # collected by the record state logger is kept untouched
+            _creators = []
+            for creator in json.get(key, []):
+                if creator is None:
+                    continue
+                creator = copy_json(creator)
                 creator_affiliations(creator)
                 lookup_person_id(creator)
                 creator_identifiers(creator)
+                _creators.append(creator)
             return _creators
 
         def _resource_type(entry):
@@ -417,6 +405,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 json_entry.pop("table_of_content")
 
         table_of_contents(json_entry)
+        resolve_person_ids(json_entry)
 
         metadata = {
             "creators": creators(json_entry),
@@ -452,12 +441,9 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
             "internal_notes",
         ]
 
-        keys = deepcopy(list(json_entry.keys()))
-        for item in helper_keys:
-            if item in keys:
-                keys.remove(item)
-
-        forgotten_keys = [key for key in keys if key not in list(metadata.keys())]
+        forgotten_keys = [
+            key for key in json_entry if key not in helper_keys and key not in metadata
+        ]
         if forgotten_keys:
             raise ManualImportRequired("Unassigned metadata key", value=forgotten_keys)
         return {k: v for k, v in metadata.items() if v}
@@ -471,7 +457,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
             for experiment in experiments:
                 if experiment.lower().strip() == "not applicable":
                     continue
-                result = search_vocabulary(experiment, "experiments")
+                result = self.vocabularies_lookup.search(experiment, "experiments")
 
                 if result["hits"]["total"]:
                     custom_fields_dict["cern:experiments"].append(
@@ -492,7 +478,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
         def field_programmes(record_json):
             programme = record_json.get("custom_fields", {}).get("cern:programmes")
             if programme:
-                result = search_vocabulary(programme, "programmes")
+                result = self.vocabularies_lookup.search(programme, "programmes")
 
                 if result["hits"]["total"]:
                     return {"id": result["hits"]["hits"][0]["id"]}
@@ -514,7 +500,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
                 "cern:departments", []
             )
             for department in departments:
-                result = search_vocabulary(department, "departments")
+                result = self.vocabularies_lookup.search(department, "departments")
                 if result["hits"]["total"]:
                     custom_fields_dict["cern:departments"].append(
                         {"id": result["hits"]["hits"][0]["id"]}
@@ -538,7 +524,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
             for accelerator in accelerators:
                 if accelerator.lower().strip() in ["not applicable", "xx"]:
                     continue
-                result = search_vocabulary(accelerator, "accelerators")
+                result = self.vocabularies_lookup.search(accelerator, "accelerators")
                 if result["hits"]["total"]:
 
                     custom_fields_dict["cern:accelerators"].append(
@@ -559,7 +545,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
             for beam in beams:
                 if beam.lower().strip() == "not applicable":
                     continue
-                result = search_vocabulary(beam, "beams")
+                result = self.vocabularies_lookup.search(beam, "beams")
                 if result["hits"]["total"]:
                     custom_fields_dict["cern:beams"].append(
                         {"id": result["hits"]["hits"][0]["id"]}
@@ -663,9 +649,7 @@ class CDSToRDMRecordEntry(RDMRecordEntry):
 
         self.record_state_logger.add_record(json_data)
 
-        clc_sync = deepcopy(json_data.get("_clc_sync", False))
-        if "_clc_sync" in json_data:
-            del json_data["_clc_sync"]
+        clc_sync = json_data.pop("_clc_sync", False)
 
         record_json_output = {
             "files": self._files(record_dump),
@@ -722,10 +706,31 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         collection=None,
         restricted=False,
         plots=False,
+        preload_lookups=False,
+        names_flush_interval=1000,
+        offline_snapshot=None,
+        result_cache=None,
+        original_dumps_dir=None,
         migration_logger=None,
         record_state_logger=None,
+        users_lookup=None,
     ):
         """Constructor."""
+        # arguments to create the same transform in the worker processes
+        self._worker_kwargs = dict(
+            throw=throw,
+            files_dump_dir=files_dump_dir,
+            missing_users=missing_users,
+            communities_ids=communities_ids,
+            dry_run=dry_run,
+            collection=collection,
+            restricted=restricted,
+            plots=plots,
+            preload_lookups=preload_lookups,
+            offline_snapshot=offline_snapshot,
+            result_cache=result_cache,
+            original_dumps_dir=original_dumps_dir,
+        )
         self.files_dump_dir = Path(files_dump_dir).absolute().as_posix()
         self.missing_users_dir = Path(missing_users).absolute().as_posix()
         self.communities_ids = communities_ids
@@ -733,14 +738,50 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         self.collection = collection
         self.restricted = restricted
         self.plots = plots
+        self.preload_lookups = preload_lookups
+        self.names_flush_interval = names_flush_interval
         self.migration_logger = migration_logger
         self.record_state_logger = record_state_logger
-        self.db_state = {"affiliations": CDSMigrationAffiliationMapping}
+        # resolve all the lookups from the snapshot, without db or search access
+        self.snapshot = offline_snapshot and LookupsSnapshot(offline_snapshot)
+        if self.snapshot:
+            users_lookup = UsersLookup(snapshot=self.snapshot)
+        self.db_state = {
+            "affiliations": AffiliationsLookup(snapshot=self.snapshot),
+            "names": NamesLookup(snapshot=self.snapshot),
+            "users": users_lookup or UsersLookup(),
+            "vocabularies": VocabulariesLookup(snapshot=self.snapshot),
+        }
+        # the original dumps are carried by reference to this store
+        self.original_dumps = original_dumps_dir and OriginalDumpsStore(
+            original_dumps_dir
+        )
+        self.result_cache = None
+        if result_cache:
+            if not self.snapshot:
+                # the results are only valid for the lookups they were computed with
+                raise ValueError(
+                    "The transform results cache needs an offline snapshot."
+                )
+            self.result_cache = TransformResultCache(
+                result_cache,
+                self.snapshot,
+                options=dict(
+                    files_dump_dir=self.files_dump_dir,
+                    missing_users=self.missing_users_dir,
+                    communities_ids=communities_ids,
+                    dry_run=dry_run,
+                    collection=collection,
+                    restricted=restricted,
+                    plots=plots,
+                ),
+            )
         super().__init__(workers, throw)
 
     def _communities_ids(self, entry, record):
         communities = record.get("communities", [])
-        communities = self.communities_ids + [slug for slug in communities]
+        # each community once, as the parent is only added once to each
+        communities = list(dict.fromkeys(self.communities_ids + communities))
         if communities:
             return {"ids": communities, "default": self.communities_ids}
         return {}
@@ -796,12 +837,57 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         ) as e:
             migration_logger.add_log(e, record=entry)
 
+    def _spill_original_dump(self, result):
+        """Replace the original dump of a result by its reference in the store."""
+        if result and self.original_dumps:
+            original_dump = result.pop("_original_dump")
+            result["_original_dump_ref"] = self.original_dumps.put(original_dump)
+        return result
+
+    def _cached_transform(self, entry):
+        """Transform an entry, or replay it from the results cache."""
+        if not self.result_cache:
+            return self._spill_original_dump(self._transform(entry))
+
+        loggers = {
+            "migration_logger": self.migration_logger,
+            "record_state_logger": self.record_state_logger,
+        }
+        key = self.result_cache.key(entry)
+        cached = self.result_cache.get(key)
+        if cached is None:
+            events = []
+            self.migration_logger = DeferredLogger("migration_logger", events)
+            self.record_state_logger = DeferredLogger("record_state_logger", events)
+            try:
+                result = self._transform(entry)
+            except Exception:
+                DeferredLogger.replay(events, loggers)
+                raise
+            finally:
+                self.migration_logger = loggers["migration_logger"]
+                self.record_state_logger = loggers["record_state_logger"]
+            if result:
+                # the legacy entry is the input, no need to store it again
+                result.pop("_original_dump")
+            self.result_cache.set(key, result, events)
+        else:
+            result, events = cached
+
+        DeferredLogger.replay(events, loggers)
+        if result:
+            result["_original_dump"] = entry
+        return self._spill_original_dump(result)
+
     def _record(self, entry):
         # could be in draft as well, depends on how we decide to publish
 
         return CDSToRDMRecordEntry(
             missing_users_dir=self.missing_users_dir,
             affiliations_mapping=self.db_state["affiliations"],
+            names_lookup=self.db_state["names"],
+            users_lookup=self.db_state["users"],
+            vocabularies_lookup=self.db_state["vocabularies"],
             dry_run=self.dry_run,
             collection=self.collection,
             restricted=self.restricted,
@@ -812,9 +898,6 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
     def _draft(self, entry):
         return None
 
-    def _parse_file_status(self, file_status):
-        pass
-
     def _versions(self, entry, record):
 
         def compute_access(file, record_access):
@@ -839,16 +922,25 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
                 # if we have anything in the status string,
                 # it means the file is restricted
                 # we pass this information to parse later in load step
+                group_mappings = current_app.config.get("CDS_ACCESS_GROUP_MAPPINGS", {})
+                if not is_supported_file_status(file["status"], group_mappings):
+                    self.migration_logger.add_information(
+                        str(file["recid"]),
+                        {
+                            "message": "Unexpected file status format, the record "
+                            "will fail to load.",
+                            "value": file["status"],
+                        },
+                    )
                 return {
                     "access_obj": {"record": record_access, "files": "restricted"},
                     "meta": file["status"],
                 }
 
-        def compute_files(file_dump, versions_dict):
-            legacy_path_root = Path("/opt/cdsweb/var/data/files/")
-            tmp_eos_root = Path(self.files_dump_dir)
-            full_path = Path(file["full_path"])
+        legacy_path_root = Path("/opt/cdsweb/var/data/files/")
+        tmp_eos_root = Path(self.files_dump_dir)
 
+        def compute_file(file, creation_date):
             if file["subformat"] in FILE_SUBFORMATS_TO_DROP:
                 self.migration_logger.add_information(
                     str(file["recid"]),
@@ -879,30 +971,23 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
                     },
                 )
 
-            versions_dict[file_dump["version"]]["files"].update(
-                {
-                    file["full_name"]: {
-                        "eos_tmp_path": tmp_eos_root
-                        / full_path.relative_to(legacy_path_root),
-                        "id_bibdoc": file["bibdocid"],
-                        "key": file["full_name"],
-                        "metadata": {
-                            "description": file["description"],
-                            "name": file["name"],
-                            "status": file["status"],
-                        },
-                        "mimetype": file["mime"],
-                        "checksum": file["checksum"],
-                        "version": file["version"],
-                        "access": file["status"],
-                        "type": file["type"],
-                        "creation_date": arrow.get(file["creation_date"])
-                        .replace(tzinfo=None)
-                        .date()
-                        .isoformat(),
-                    }
-                }
-            )
+            return {
+                "eos_tmp_path": tmp_eos_root
+                / Path(file["full_path"]).relative_to(legacy_path_root),
+                "id_bibdoc": file["bibdocid"],
+                "key": file["full_name"],
+                "metadata": {
+                    "description": file["description"],
+                    "name": file["name"],
+                    "status": file["status"],
+                },
+                "mimetype": file["mime"],
+                "checksum": file["checksum"],
+                "version": file["version"],
+                "access": file["status"],
+                "type": file["type"],
+                "creation_date": creation_date.date().isoformat(),
+            }
 
         # grouping draft attributes by version
         # we build temporary representation of each version
@@ -911,19 +996,26 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         versions = OrderedDict()
         # we start versions from files (because this is the only way of
         # mapping version of files to version of records from legacy)
-        _files = entry["files"]
         record_access = record["access"]
-        for file in _files:
+        # files of the same version often share the creation date
+        creation_dates = {}
+        files_by_version = {}
+        for file in entry["files"]:
+            creation_date = creation_dates.get(file["creation_date"])
+            if creation_date is None:
+                creation_date = arrow.get(file["creation_date"]).replace(tzinfo=None)
+                creation_dates[file["creation_date"]] = creation_date
             if file["version"] not in versions:
                 versions[file["version"]] = {
                     "files": {},
-                    "publication_date": arrow.get(file["creation_date"]).replace(
-                        tzinfo=None
-                    ),
+                    "publication_date": creation_date,
                     "access": compute_access(file, record_access),
                 }
+                files_by_version[file["version"]] = {}
 
-            compute_files(file, versions)
+            file_version = compute_file(file, creation_date)
+            if file_version:
+                files_by_version[file["version"]][file["full_name"]] = file_version
 
         versioned_files = {}
         # creates a collection of files per each version
@@ -931,7 +1023,7 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         # if for file A new version was uploaded (version 2),
         # we need to preserve the file B for version 2 of the record
         for version in versions.keys():
-            versioned_files |= versions.get(version, {}).get("files")
+            versioned_files |= files_by_version[version]
             versions[version]["files"] = versioned_files
         publication_date = record["json"]["metadata"]["publication_date"]
 
@@ -953,6 +1045,9 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         return []
 
     def should_skip(self, entry):
+        if self.snapshot:
+            status = self.snapshot.legacy_recid_status(entry["recid"])
+            return status == PIDStatus.REGISTERED.value
         pid = PersistentIdentifier.query.filter_by(
             pid_type="lrecid",
             pid_value=str(entry["recid"]),
@@ -960,21 +1055,90 @@ class CDSToRDMRecordTransform(RDMRecordTransform):
         ).one_or_none()
         return pid is not None
 
+    def _preload_lookups(self):
+        """Warm up the run-wide lookup caches."""
+        self.db_state["affiliations"].warm()
+        self.db_state["names"].warm()
+        self.db_state["users"].warm()
+
+    def _serial_transform(self, entries):
+        """Transform the entries in the current process."""
+        for entry in entries:
+            if self.should_skip(entry):
+                yield
+                continue
+            try:
+                yield self._cached_transform(entry)
+            except Exception:
+                self.logger.exception(entry, exc_info=True)
+                if self._throw:
+                    raise
+                yield
+
+    def _parallel_transform(self, entries):
+        """Transform the entries in a pool of worker processes.
+
+        Each worker creates its own application context and lookups. The logs
+        of the workers are replayed on the loggers of the run and the results
+        are yielded in the order of the entries.
+        """
+        loggers = {
+            "migration_logger": self.migration_logger,
+            "record_state_logger": self.record_state_logger,
+        }
+        mp_context = multiprocessing.get_context("spawn")
+        log_queue = mp_context.Queue()
+        log_listener = QueueListener(log_queue, LogRecordDispatcher())
+        log_listener.start()
+        executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=mp_context,
+            initializer=workers.init_worker,
+            initargs=(
+                self._worker_kwargs,
+                log_queue,
+                logging.getLogger().getEffectiveLevel(),
+            ),
+        )
+        # the results are yielded in the order of the entries: a slow entry stops
+        # the submissions at 4 per worker, rather than letting the finished
+        # records behind it pile up
+        window = deque()
+        max_window = self._workers * 4
+        try:
+            entries = iter(entries)
+            while True:
+                for entry in islice(entries, max_window - len(window)):
+                    window.append(executor.submit(workers.transform_entry, entry))
+                if not window:
+                    break
+                result, events, names_pending = window.popleft().result()
+                DeferredLogger.replay(events, loggers)
+                self.db_state["names"].merge_pending(names_pending)
+                yield result
+        finally:
+            for future in window:
+                future.cancel()
+            executor.shutdown(wait=True)
+            log_listener.stop()
+
     def run(self, entries):
         """Run transformation step."""
-        if self._workers is None:
-            for entry in entries:
-                if self.should_skip(entry):
-                    continue
-                try:
-                    yield self._transform(entry)
-                except Exception:
-                    self.logger.exception(entry, exc_info=True)
-                    if self._throw:
-                        raise
-                    continue
+        if self._workers:
+            transformed = self._parallel_transform(entries)
         else:
-            yield from self._multiprocess_transform(entries)
+            if self.preload_lookups:
+                self._preload_lookups()
+            transformed = self._serial_transform(entries)
+        try:
+            for i, result in enumerate(transformed, start=1):
+                if i % self.names_flush_interval == 0:
+                    self.db_state["names"].flush()
+                if result is not None:
+                    yield result
+        finally:
+            # write the names identifiers merged during the run
+            self.db_state["names"].flush()
 
     #
     #
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""CDS-RDM transform worker processes module.
+
+Each worker process creates its own application, database session and lookup
+caches, and transforms the entries sent by the parent process.
+"""
+
+import logging
+from logging.handlers import QueueHandler
+
+from invenio_app.factory import create_app
+
+from cds_migrator_kit.reports.log import DeferredLogger
+
+_app_context = None
+_transform = None
+_events = []
+
+
+def init_worker(transform_kwargs, log_queue, log_level):
+    """Initialize the worker process.
+
+    Python logging records of the worker are sent to the parent process
+    through ``log_queue``.
+    """
+    global _app_context, _transform
+    # avoid circular import
+    from cds_migrator_kit.rdm.records.transform.transform import (
+        CDSToRDMRecordTransform,
+    )
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [QueueHandler(log_queue)]
+    root_logger.setLevel(log_level)
+
+    _app_context = create_app().app_context()
+    _app_context.push()
+
+    _transform = CDSToRDMRecordTransform(
+        **transform_kwargs,
+        migration_logger=DeferredLogger("migration_logger", _events),
+        record_state_logger=DeferredLogger("record_state_logger", _events),
+    )
+    if _transform.preload_lookups:
+        _transform._preload_lookups()
+
+
+def transform_entry(entry):
+    """Transform an entry in the worker process.
+
+    Returns the transformed entry (None if skipped or failed), the logs
+    events to replay and the names identifiers merged while transforming it.
+    """
+    _events.clear()
+    result = None
+    try:
+        if not _transform.should_skip(entry):
+            result = _transform._cached_transform(entry)
+    except Exception:
+        _transform.logger.exception(entry, exc_info=True)
+        if _transform._throw:
+            raise
+    return result, list(_events), _transform.db_state["names"].pop_pending()
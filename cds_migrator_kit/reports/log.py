@@ -189,7 +189,9 @@ class RecordStateLogger:
         )
         self.keep_logs = keep_logs
 
+        # records serialized to JSON, but the last added one
         self._records = {}
+        self._last_recid = None
         self._record_states = []
         self._existing_recids = set()
 
@@ -202,7 +204,10 @@ class RecordStateLogger:
         if os.path.exists(self.RECORD_DUMP_FILEPATH):
             try:
                 with open(self.RECORD_DUMP_FILEPATH, encoding="utf-8") as f:
-                    self._records = json.load(f)
+                    self._records = {
+                        recid: self._serialize(record)
+                        for recid, record in json.load(f).items()
+                    }
                 self._existing_recids = set(self._records.keys())
             except Exception:
                 self._records = {}
@@ -220,11 +225,33 @@ class RecordStateLogger:
         """Initialize logger."""
         self._load_existing_logs()
 
+    @staticmethod
+    def _serialize(record):
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+    def _compact(self):
+        """Serialize the last added record, which is done being transformed.
+
+        The records are kept as JSON strings, a fraction of the memory of the
+        records themselves.
+        """
+        if self._last_recid is not None:
+            record = self._records[self._last_recid]
+            try:
+                self._records[self._last_recid] = self._serialize(record)
+            except (TypeError, ValueError):
+                # kept as is, fails when the records are written as before
+                pass
+            self._last_recid = None
+
     def add_record(self, record, **kwargs):
         """Add record to list of collected records."""
         recid = str(record["legacy_recid"])
         if recid not in self._existing_recids:
+            self._compact()
+            # serialized later, the transform still updates it
             self._records[recid] = record
+            self._last_recid = recid
             self._existing_recids.add(recid)
 
     def add_record_state(self, record_state, **kwargs):
@@ -234,11 +261,14 @@ class RecordStateLogger:
     def finalise(self):
         """Finalise logging files."""
         # Write records
+        self._compact()
         with open(self.RECORD_DUMP_FILEPATH, "w", encoding="utf-8") as f:
             f.write("{\n")
             items = list(self._records.items())
             for i, (recid, record) in enumerate(items):
-                json_str = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+                json_str = record
+                if not isinstance(record, str):
+                    json_str = self._serialize(record)
                 comma = "," if i < len(items) - 1 else ""
                 f.write(f'"{recid}":{json_str}{comma}\n')
             f.write("}")
@@ -251,3 +281,61 @@ class RecordStateLogger:
                 comma = "," if i < len(self._record_states) - 1 else ""
                 f.write(f"{json_str}{comma}\n")
             f.write("]")
+
+
+class DeferredLogger:
+    """Record the calls made to a migration logger, to replay them later.
+
+    Used by the transform and load worker processes, which cannot write to the
+    logs files of the run: the calls are sent back to the parent process with
+    each record and replayed there on the real loggers, in order.
+    """
+
+    def __init__(self, name, events):
+        """Constructor."""
+        self.name = name
+        self.events = events
+
+    def _defer(self, method, *args, **kwargs):
+        self.events.append((self.name, method, args, kwargs))
+
+    def add_log(self, exc, record=None, key=None, value=None):
+        """Defer an exception log."""
+        if record:
+            # only the recid of the record is logged
+            record = {
+                "recid": record.get("recid", None)
+                or record.get("record", {}).get("recid")
+            }
+        self._defer("add_log", exc, record=record, key=key, value=value)
+
+    def add_information(self, recid, state):
+        """Defer a temporary success state for recid."""
+        self._defer("add_information", recid, state)
+
+    def finalise_record(self, recid):
+        """Defer a success log of recid."""
+        self._defer("finalise_record", recid)
+
+    def add_record(self, record, **kwargs):
+        """Defer adding a record to the collected records."""
+        self._defer("add_record", record, **kwargs)
+
+    def add_record_state(self, record_state, **kwargs):
+        """Defer adding a record state."""
+        self._defer("add_record_state", record_state, **kwargs)
+
+    @staticmethod
+    def replay(events, loggers):
+        """Replay deferred calls on the loggers, indexed by name."""
+        for name, method, args, kwargs in events:
+            getattr(loggers[name], method)(*args, **kwargs)
+
+
+class LogRecordDispatcher(logging.Handler):
+    """Handle the logging records of the workers with the parent loggers."""
+
+    def handle(self, record):
+        """Pass the record to the logger it was emitted with."""
+        logging.getLogger(record.name).handle(record)
+        return True
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# cds-migrator-kit is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Pipelined migration stream."""
+
+import queue
+import threading
+from contextlib import closing
+from datetime import datetime
+
+from flask import current_app
+from invenio_rdm_migrator.logging import Logger
+from invenio_rdm_migrator.streams import Stream
+
+from cds_migrator_kit.reports.log import DeferredLogger
+
+_DONE = object()
+
+LOGGERS = ("migration_logger", "record_state_logger")
+
+
+class PipelinedStream(Stream):
+    """ETL stream running the extract and transform ahead of the load.
+
+    The entries are extracted and transformed in a producer thread, with its
+    own application context, and handed to the load through a queue of at
+    most ``queue_size`` entries. The transform can itself run in worker
+    processes, and the load mostly waits on the database, the storage and the
+    search cluster, so both steps run concurrently. The logs of the transform
+    are handed to the load along with the entries, and only written by the
+    load thread.
+    """
+
+    def __init__(self, name, extract, transform, load, queue_size=100):
+        """Constructor."""
+        super().__init__(name, extract, transform, load)
+        self.queue_size = queue_size
+
+    def _entries(self):
+        """Extracted and transformed entries."""
+        entries = self.extract.run() if self.extract else iter(())
+        if self.transform:
+            entries = self.transform.run(entries)
+        return entries
+
+    def _defer_logs(self, events):
+        """Make the transform defer its logs to ``events``.
+
+        Returns the loggers of the transform, to replay the logs on.
+        """
+        loggers = {}
+        for name in LOGGERS:
+            logger = getattr(self.transform, name, None)
+            if logger is not None:
+                loggers[name] = logger
+                setattr(self.transform, name, DeferredLogger(name, events))
+        return loggers
+
+    def _produce(self, app, entries_queue, stop, errors, events):
+        """Fill the queue, until the end of the entries or a stop."""
+
+        def put(item):
+            # along with the logs of the transform since the previous entry
+            item_events = list(events)
+            events.clear()
+            while not stop.is_set():
+                try:
+                    entries_queue.put((item_events, item), timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            with app.app_context():
+                # closed in this thread, to clean up the transform here
+                with closing(self._entries()) as entries:
+                    for entry in entries:
+                        if not put(entry):
+                            return
+        except BaseException as exc:
+            errors.append(exc)
+        finally:
+            put(_DONE)
+
+    def _consume(self, entries_queue, errors, loggers):
+        """Iterate over the queued entries, writing the logs of the transform."""
+        while True:
+            events, entry = entries_queue.get()
+            DeferredLogger.replay(events, loggers)
+            if entry is _DONE:
+                break
+            yield entry
+        if errors:
+            raise errors[0]
+
+    def run(self, cleanup=False):
+        """Run the stream, transforming ahead of the load."""
+        logger = Logger.get_logger()
+        start_time = datetime.now()
+        logger.info(f"Stream {self.name} started {start_time.isoformat()}")
+
+        entries_queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        # the loggers are not thread safe, the load writes the transform logs
+        events = []
+        loggers = self._defer_logs(events)
+        producer = threading.Thread(
+            target=self._produce,
+            args=(
+                current_app._get_current_object(),
+                entries_queue,
+                stop,
+                errors,
+                events,
+            ),
+            name=f"{self.name}-transform",
+            daemon=True,
+        )
+        producer.start()
+        try:
+            self.load.run(
+                self._consume(entries_queue, errors, loggers), cleanup=cleanup
+            )
+        finally:
+            # stop the transform if the load failed
+            stop.set()
+            producer.join()
+            for name, transform_logger in loggers.items():
+                setattr(self.transform, name, transform_logger)
+
+        end_time = datetime.now()
+        logger.info(f"Stream {self.name} ended {end_time.isoformat()}")
+        logger.info(f"Execution time: {end_time - start_time}")
@@ -18,6 +18,8 @@ from cds_migrator_kit.reports.log import (
     RecordStateLogger,
     StandardLogger,
 )
+from cds_migrator_kit.runner.pipeline import PipelinedStream
+from cds_migrator_kit.users.lookups import UsersLookup
 
 
 # local version of the invenio-rdm-migrator Runner class
@@ -31,7 +33,16 @@ class Runner:
         with open(filepath) as f:
             return yaml.safe_load(f)
 
-    def __init__(self, stream_definitions, config_filepath, dry_run, collection, keep_logs):
+    def __init__(
+        self,
+        stream_definitions,
+        config_filepath,
+        dry_run,
+        collection,
+        keep_logs,
+        offline_snapshot=None,
+        result_cache=None,
+    ):
         """Constructor."""
         config = self._read_config(config_filepath)
         self.collection = collection
@@ -39,6 +50,8 @@ class Runner:
         self.db_uri = config.get("db_uri")
         self.migration_logger = MigrationProgressLogger(collection=self.collection, keep_logs=self.keep_logs)
         self.record_state_logger = RecordStateLogger(collection=self.collection, keep_logs=self.keep_logs)
+        # shared by the transform and load steps
+        self.users_lookup = UsersLookup()
         # start parsing streams
         self.streams = []
         for definition in stream_definitions:
@@ -77,10 +90,23 @@ class Runner:
                         restricted=self.restricted,
                         migration_logger=self.migration_logger,
                         record_state_logger=self.record_state_logger,
+                        users_lookup=self.users_lookup,
+                        offline_snapshot=offline_snapshot,
+                        result_cache=result_cache,
                     )
 
+                # transform ahead of the load, with that many entries in between
+                pipeline_queue_size = stream_config[collection].get(
+                    "pipeline_queue_size"
+                )
+                stream_cls = Stream
+                stream_kwargs = {}
+                if pipeline_queue_size:
+                    stream_cls = PipelinedStream
+                    stream_kwargs["queue_size"] = pipeline_queue_size
+
                 self.streams.append(
-                    Stream(
+                    stream_cls(
                         definition.name,
                         extract,
                         transform,
@@ -92,8 +118,11 @@ class Runner:
                             collection=collection,
                             migration_logger=self.migration_logger,
                             record_state_logger=self.record_state_logger,
+                            users_lookup=self.users_lookup,
+                            offline_snapshot=offline_snapshot,
                             **stream_config[collection].get("load", {}),
                         ),
+                        **stream_kwargs,
                     )
                 )
 
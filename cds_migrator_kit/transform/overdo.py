@@ -6,7 +6,6 @@
 # the terms of the MIT License; see LICENSE file for more details.
 
 """CDS-RDM overdo model."""
-from copy import deepcopy
 
 from cds_dojson.overdo import Overdo
 from dojson._compat import iteritems
@@ -14,6 +13,19 @@ from dojson.errors import IgnoreKey, MissingRule
 from dojson.utils import GroupableOrderedDict
 
 
+def copy_json(value):
+    """Copy the nested dicts and lists of a JSON value.
+
+    Cheaper than ``deepcopy`` for plain JSON values, e.g. the default fields
+    of the models.
+    """
+    if isinstance(value, dict):
+        return {k: copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_json(v) for v in value]
+    return value
+
+
 class CdsOverdo(Overdo):
     """Overwrite API of Overdo dojson class."""
 
@@ -54,7 +66,8 @@ class CdsOverdo(Overdo):
         output = {}
 
         if self._default_fields:
-            output.update(**deepcopy(self._default_fields))
+            # rules extend the default fields in place
+            output.update(copy_json(self._default_fields))
 
         if self.index is None:
             self.build()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# cds-migrator-kit is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""cds-migrator-kit users lookup."""
+
+from invenio_accounts.models import User
+from invenio_db import db
+
+
+class UsersLookup:
+    """Resolve users emails to user ids.
+
+    Resolved emails are kept for the whole run, including the ones without a
+    matching user (stored as ``None``), so that each email is queried at most
+    once. The lookup is shared between the transform and the load steps.
+
+    If a lookups snapshot is given, the users are read from it instead.
+    """
+
+    def __init__(self, snapshot=None):
+        """Constructor."""
+        self._users = {}
+        self._snapshot = snapshot
+        self._warm = False
+
+    def _fetch(self, emails=None):
+        """Fetch the user ids of emails, or of all the users if None."""
+        if self._snapshot:
+            return self._snapshot.users(emails)
+        users = db.session.query(User.email, User.id)
+        if emails is not None:
+            users = users.filter(User.email.in_(emails))
+        return dict(users)
+
+    def warm(self):
+        """Preload the ids of all the users with one query."""
+        self._users.update(self._fetch())
+        self._warm = True
+
+    def resolve(self, emails):
+        """Resolve, with one query, the emails not looked up yet."""
+        missing = {email for email in emails if email not in self._users}
+        if not missing:
+            return
+        resolved = {} if self._warm else self._fetch(missing)
+        for email in missing:
+            self._users[email] = resolved.get(email)
+
+    def get(self, email):
+        """Get the user id of an email, or None if there is no such user."""
+        if email not in self._users:
+            self.resolve([email])
+        return self._users[email]
+
+    def get_many(self, emails):
+        """Get the user ids of the emails which belong to a user."""
+        self.resolve(emails)
+        return {
+            email: self._users[email]
+            for email in emails
+            if self._users[email] is not None
+        }
+
+    def items(self):
+        """Iterate over the resolved emails which belong to a user."""
+        for email, user_id in self._users.items():
+            if user_id is not None:
+                yield email, user_id
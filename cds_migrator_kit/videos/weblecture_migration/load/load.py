@@ -64,6 +64,8 @@ class CDSVideosLoad(Load):
         collection=None,  # weblectures
         migration_logger=None,
         record_state_logger=None,
+        users_lookup=None,  # Not used but needed for runner
+        offline_snapshot=None,  # Not used but needed for runner
     ):
         """Constructor."""
         self.dry_run = dry_run
@@ -817,6 +817,9 @@ class CDSToVideosRecordTransform(RDMRecordTransform):
         restricted=False,  # Not used but needed for runner
         migration_logger=None,
         record_state_logger=None,
+        users_lookup=None,  # Not used but needed for runner
+        offline_snapshot=None,  # Not used but needed for runner
+        result_cache=None,  # Not used but needed for runner
     ):
         """Constructor."""
         self.eos_file_paths_dir = Path(eos_file_paths_dir).absolute().as_posix()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+from cds_migrator_kit.rdm.records.access import (
+    FileStatus,
+    is_supported_file_status,
+    parse_file_status,
+)
+
+
+def test_parse_file_status():
+    """Test the parsing of the legacy firerole statuses."""
+    status = (
+        'firerole: allow group "it-dep","hr-dep [CERN]"\r\n'
+        'allow email "uploader@inveniosoftware.org"'
+    )
+    assert parse_file_status(status) == FileStatus(
+        groups=frozenset({"it-dep", "hr-dep"}),
+        emails=frozenset({"uploader@inveniosoftware.org"}),
+        deny_until=(),
+    )
+
+    status = 'firerole: allow group "council-full [CERN]"\ndeny until "1996-02-01"\nallow all'
+    parsed = parse_file_status(status)
+    assert parsed.groups == frozenset({"council-full"})
+    assert parsed.emails == frozenset()
+    assert parsed.deny_until == ("1996-02-01",)
+    # memoized by the raw status
+    assert parse_file_status(status) is parsed
+
+    assert parse_file_status("firerole: deny all") is None
+
+
+def test_is_supported_file_status():
+    """Test the statuses the load can compute the access grants of."""
+    group_mappings = {"cms": ["cms-members"]}
+    assert is_supported_file_status("restricted", group_mappings)
+    assert is_supported_file_status("cms", group_mappings)
+    assert is_supported_file_status('firerole: allow group "it-dep"', group_mappings)
+    assert not is_supported_file_status("firerole: deny all", group_mappings)
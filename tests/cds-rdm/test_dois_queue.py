@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the DOIs queue."""
+
+import sqlite3
+
+from cds_migrator_kit.rdm.records.load.dois import DOIsQueue, flush_dois_queue
+
+
+def test_dois_queue(tmp_path):
+    """Test the queued records statuses."""
+    filepath = str(tmp_path / "dois.db")
+    queue = DOIsQueue(filepath)
+    queue.add("abcd-1234", legacy_recid=1)
+    queue.add("efgh-5678")
+    assert sorted(queue.pending(10)) == ["abcd-1234", "efgh-5678"]
+    assert len(queue.pending(1)) == 1
+
+    queue.mark("abcd-1234", "done")
+    queue.mark("efgh-5678", "failed", error="timeout")
+    assert queue.pending(10) == []
+    assert queue.counts() == {"done": 1, "failed": 1}
+
+    # persisted, and queued again when added again or retried
+    queue = DOIsQueue(filepath)
+    queue.add("abcd-1234", legacy_recid=1)
+    queue.reset_failed()
+    assert sorted(queue.pending(10)) == ["abcd-1234", "efgh-5678"]
+    assert queue.counts() == {"pending": 2}
+
+
+def test_flush_dois_queue(app, tmp_path, mocker):
+    """Test the failed records are kept in the queue with their error."""
+    filepath = str(tmp_path / "dois.db")
+    queue = DOIsQueue(filepath)
+    for recid in ("abcd-1234", "efgh-5678", "ijkl-9012"):
+        queue.add(recid)
+
+    def republish(app, recid):
+        if recid == "efgh-5678":
+            raise ValueError("DOI registration failed")
+
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.dois.republish", side_effect=republish
+    )
+    assert flush_dois_queue(filepath, workers=2, batch_size=2) == (3, 1)
+    assert queue.counts() == {"done": 2, "failed": 1}
+    with sqlite3.connect(filepath) as conn:
+        error = conn.execute("SELECT error FROM dois WHERE recid = 'efgh-5678'")
+        assert error.fetchone() == ("DOI registration failed",)
+
+    # nothing left to publish
+    assert flush_dois_queue(filepath) == (0, 0)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the files staging of the load."""
+
+from cds_migrator_kit.rdm.records.load.staging import FilesStaging
+
+
+def _sources(tmp_path, *names):
+    """Create source files of 10 bytes."""
+    sources = []
+    for name in names:
+        path = tmp_path / "eos" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(name.encode() * 10)
+        sources.append(str(path))
+    return sources
+
+
+def _staged(staging_dir):
+    """Staged copies of the staging directory."""
+    return [path for path in staging_dir.rglob("*") if path.is_file()]
+
+
+def test_files_staging(tmp_path):
+    """Test the files are read from their staged copy until released."""
+    staging_dir = tmp_path / "staging"
+    staging = FilesStaging(staging_dir, max_size=100, workers=2)
+    a, b = _sources(tmp_path, "a", "b")
+    # staged once, loaded twice
+    staging.stage([a, b, a])
+    with staging.open(a) as fp:
+        assert fp.read() == b"a" * 10
+        assert fp.name.startswith(str(staging_dir))
+    with staging.open(b) as fp:
+        assert fp.name.startswith(str(staging_dir))
+    assert len(_staged(staging_dir)) == 2
+
+    staging.release(a)
+    staging.release(b)
+    assert len(_staged(staging_dir)) == 1
+    staging.release(a)
+    assert _staged(staging_dir) == []
+
+    # not staged, read from the source
+    with staging.open(a) as fp:
+        assert fp.name == a
+    staging.close()
+
+
+def test_files_staging_eviction(tmp_path):
+    """Test the least recently used copies are evicted above the max size."""
+    staging_dir = tmp_path / "staging"
+    staging = FilesStaging(staging_dir, max_size=25, workers=1)
+    a, b, c = _sources(tmp_path, "a", "b", "c")
+    staging.stage([a, b])
+    staging.open(a).close()
+    staging.open(b).close()
+    # a is read again, b is the least recently used
+    staging.open(a).close()
+    staging.stage([c])
+    with staging.open(c) as fp:
+        assert fp.name.startswith(str(staging_dir))
+    with staging.open(b) as fp:
+        assert fp.name == b
+        assert fp.read() == b"b" * 10
+    with staging.open(a) as fp:
+        assert fp.name.startswith(str(staging_dir))
+    staging.close()
+    assert _staged(staging_dir) == []
+
+
+def test_files_staging_prefetch(tmp_path):
+    """Test the files of the next entries are staged ahead of their load."""
+    staging_dir = tmp_path / "staging"
+    staging = FilesStaging(staging_dir, max_size=100)
+    sources = dict(zip([1, 2, 3], _sources(tmp_path, "a", "b", "c")))
+
+    loaded = []
+    for entry in staging.prefetch([1, 2, 3], 1, lambda entry: [sources[entry]]):
+        with staging.open(sources[entry]) as fp:
+            assert fp.name.startswith(str(staging_dir))
+        staging.release(sources[entry])
+        loaded.append(entry)
+    assert loaded == [1, 2, 3]
+    # closed at the end of the entries
+    assert _staged(staging_dir) == []
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the original legacy dumps writer."""
+
+import gzip
+import json
+import uuid
+
+import pytest
+from cds_rdm.legacy.models import CDSMigrationLegacyRecord
+
+from cds_migrator_kit.rdm.records.load.legacy_records import LegacyRecordsWriter
+
+
+def _legacy_record(legacy_recid, original_dump=None):
+    """Arguments of the original dump of a loaded record."""
+    return dict(
+        legacy_recid=legacy_recid,
+        parent_object_uuid=uuid.uuid4(),
+        migrated_record_object_uuid=uuid.uuid4(),
+        original_dump=original_dump or {"recid": legacy_recid},
+    )
+
+
+def test_legacy_records_writer_options(tmp_path):
+    """Test the dumps are only compressed to files."""
+    with pytest.raises(ValueError):
+        LegacyRecordsWriter(store="eos")
+    with pytest.raises(ValueError):
+        LegacyRecordsWriter(store="files")
+    with pytest.raises(ValueError):
+        LegacyRecordsWriter(compression="gzip", dumps_dir=str(tmp_path))
+
+
+def test_legacy_records_writer_files(tmp_path):
+    """Test the rows of the files store reference the dumps files."""
+    writer = LegacyRecordsWriter(
+        store="files", dumps_dir=str(tmp_path), compression="gzip"
+    )
+    row = writer.row(**_legacy_record("2742366", {"recid": "2742366", "a": "é"}))
+    assert row["json"] == {
+        "legacy_recid": "2742366",
+        "file": "66/2742366.json.gz",
+        "compression": "gzip",
+    }
+    dump = gzip.decompress((tmp_path / row["json"]["file"]).read_bytes())
+    assert json.loads(dump) == {"recid": "2742366", "a": "é"}
+
+    # stored in the column by default
+    row = LegacyRecordsWriter().row(**_legacy_record("2742366"))
+    assert row["json"] == {"recid": "2742366"}
+
+
+def test_legacy_records_writer_batch(app, db):
+    """Test the rows are inserted without committing, failing ones apart."""
+    writer = LegacyRecordsWriter(batch_size=2)
+    with writer.record():
+        writer.add(**_legacy_record("1"))
+    with pytest.raises(ValueError):
+        with writer.record():
+            writer.add(**_legacy_record("2"))
+            raise ValueError()
+    assert not writer.is_due()
+    with writer.record():
+        writer.add(**_legacy_record("3"))
+        # not serializable, fails to insert
+        writer.add(**_legacy_record("4", {"recid": object()}))
+    assert writer.is_due()
+
+    errors = writer.flush()
+    assert [legacy_recid for legacy_recid, _ in errors] == ["4"]
+    assert not writer.is_due()
+    # in the transaction of the records, committed with them
+    assert db.session().in_transaction()
+    legacy_recids = db.session.query(CDSMigrationLegacyRecord.legacy_recid)
+    assert sorted(legacy_recid for (legacy_recid,) in legacy_recids) == ["1", "3"]
+    assert writer.flush() == []
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the communities load."""
+
+import pytest
+from invenio_pidstore.errors import PIDDoesNotExistError
+
+from cds_migrator_kit.errors import ManualImportRequired
+from cds_migrator_kit.rdm.records.load.load import CDSRecordServiceLoad
+
+COMMUNITIES = {
+    "cms": "8a1c0f6e-3b7d-4c0e-9a9c-2f4b6d1e5a01",
+    "8a1c0f6e-3b7d-4c0e-9a9c-2f4b6d1e5a01": "8a1c0f6e-3b7d-4c0e-9a9c-2f4b6d1e5a01",
+    "atlas": "c5e2b9d4-7f1a-4e3b-8d6c-0a9f2e4b7c02",
+}
+"""Ids of the existing communities, by id or slug."""
+
+
+@pytest.fixture()
+def resolve(mocker):
+    """Mock the resolution of the communities PIDs."""
+
+    def resolve(pid_value):
+        if pid_value not in COMMUNITIES:
+            raise PIDDoesNotExistError("comid", pid_value)
+        return mocker.Mock(id=COMMUNITIES[pid_value])
+
+    community = mocker.patch("cds_migrator_kit.rdm.records.load.load.Community")
+    community.pid.resolve.side_effect = resolve
+    return community.pid.resolve
+
+
+def _entry(recid, ids, default=None):
+    """Transformed entry of a record in the given communities."""
+    return {
+        "record": {"recid": recid},
+        "parent": {"json": {"communities": {"ids": ids, "default": default}}},
+    }
+
+
+def _load_communities(load, mocker, entry):
+    """Load the communities of an entry, returning the parent communities."""
+    draft = mocker.Mock()
+    load._load_communities(draft, entry)
+    return draft._record.parent.communities
+
+
+def test_load_communities(app, tmp_path, mocker, resolve):
+    """Test the communities are added by id, given by id or slug."""
+    load = CDSRecordServiceLoad(
+        db_uri=None, data_dir=str(tmp_path), tmp_dir=str(tmp_path)
+    )
+
+    communities = _load_communities(
+        load, mocker, _entry("1", ["cms", "atlas"], default="cms")
+    )
+
+    assert [call.args for call in communities.add.call_args_list] == [
+        (COMMUNITIES["cms"],),
+        (COMMUNITIES["atlas"],),
+    ]
+    assert communities.default == COMMUNITIES["cms"]
+
+
+def test_load_communities_resolved_once(app, tmp_path, mocker, resolve):
+    """Test each community is resolved once per run."""
+    load = CDSRecordServiceLoad(
+        db_uri=None, data_dir=str(tmp_path), tmp_dir=str(tmp_path)
+    )
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.mint_legacy_redirects",
+        return_value=[],
+    )
+
+    _load_communities(load, mocker, _entry("1", ["cms", "atlas"], default="cms"))
+    communities = _load_communities(load, mocker, _entry("2", ["atlas", "cms"]))
+
+    assert [call.args[0] for call in resolve.call_args_list] == ["cms", "atlas"]
+    assert communities.add.call_count == 2
+    assert communities.default is None
+
+    # resolved again on the next run
+    load._cleanup()
+    _load_communities(load, mocker, _entry("3", ["cms"]))
+    assert resolve.call_count == 3
+
+
+def test_load_communities_unknown(app, tmp_path, mocker, resolve):
+    """Test a record in a community which does not exist is not loaded."""
+    load = CDSRecordServiceLoad(
+        db_uri=None, data_dir=str(tmp_path), tmp_dir=str(tmp_path)
+    )
+
+    with pytest.raises(ManualImportRequired) as excinfo:
+        _load_communities(load, mocker, _entry("1", ["cms", "alice"]))
+
+    assert excinfo.value.value == "alice"
+    assert excinfo.value.recid == "1"
+    # not cached, looked up again by the next record
+    with pytest.raises(ManualImportRequired):
+        _load_communities(load, mocker, _entry("2", ["alice"]))
+    assert [call.args[0] for call in resolve.call_args_list] == [
+        "cms",
+        "alice",
+        "alice",
+    ]
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the files load."""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+
+from cds_migrator_kit.errors import ManualImportRequired
+from cds_migrator_kit.rdm.records.load.load import CDSRecordServiceLoad
+
+
+def _version_files(count):
+    """Files of a record version, by filename."""
+    return {
+        f"{i}.pdf": {
+            "key": f"{i}.pdf",
+            "eos_tmp_path": f"/eos/{i}.pdf",
+            "id_bibdoc": i,
+            "checksum": None,
+            "metadata": {},
+        }
+        for i in range(count)
+    }
+
+
+def _entry():
+    """Transformed entry of the loaded record."""
+    return {"record": {"recid": "2742366"}}
+
+
+def _service(mocker):
+    """Mock the records service, reading the files contents to the end."""
+    service = mocker.MagicMock()
+    service.draft_files.set_file_content.side_effect = (
+        lambda identity, draft_id, key, stream: stream.read()
+    )
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.current_rdm_records_service", service
+    )
+    return service
+
+
+@pytest.fixture()
+def submitted(mocker):
+    """Futures of the files submitted to the read-ahead pool, by path."""
+    submitted = {}
+
+    class Executor(ThreadPoolExecutor):
+        def submit(self, fn, filepath, *args):
+            submitted[filepath] = super().submit(fn, filepath, *args)
+            return submitted[filepath]
+
+    mocker.patch("cds_migrator_kit.rdm.records.load.load.ThreadPoolExecutor", Executor)
+    return submitted
+
+
+def test_files_contents_read_ahead(app, tmp_path, mocker, submitted):
+    """Test the files are read ahead in order, a bounded number at a time."""
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.spool_legacy_file",
+        side_effect=lambda filepath, tmp_dir: f"content of {filepath}",
+    )
+    load = CDSRecordServiceLoad(
+        db_uri=None, data_dir=str(tmp_path), tmp_dir=str(tmp_path), files_workers=2
+    )
+    version_files = _version_files(10)
+
+    filenames = []
+    for i, (filename, file_data, content) in enumerate(
+        load._files_contents(version_files)
+    ):
+        # twice the workers in the pool, the current file included
+        assert len(submitted) == min(i + 4, 10)
+        assert file_data is version_files[filename]
+        assert content() == f"content of {file_data['eos_tmp_path']}"
+        filenames.append(filename)
+    assert filenames == list(version_files)
+    assert list(submitted) == [f["eos_tmp_path"] for f in version_files.values()]
+
+
+def test_load_files_cancel(app, tmp_path, mocker, submitted):
+    """Test the files read ahead are cancelled when a file fails to load."""
+    spooled = []
+
+    def spool_legacy_file(filepath, tmp_dir):
+        spooled.append(filepath)
+        if filepath != "/eos/0.pdf":
+            # busy reading, until the read ahead is cancelled
+            threading.Event().wait(timeout=1)
+        return BytesIO(filepath.encode())
+
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.spool_legacy_file",
+        side_effect=spool_legacy_file,
+    )
+    service = _service(mocker)
+
+    def init_files(identity, draft_id, data):
+        if data[0]["key"] == "1.pdf":
+            raise ValueError("init failed")
+
+    service.draft_files.init_files.side_effect = init_files
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        files_workers=1,
+        migration_logger=mocker.Mock(),
+    )
+    version_files = _version_files(10)
+    version_files["0.pdf"]["checksum"] = hashlib.md5(b"/eos/0.pdf").hexdigest()
+
+    # the logged error keeps the frames of the load alive with its traceback
+    with pytest.raises(ValueError) as excinfo:
+        load._load_files(mocker.Mock(id="abcd-1234"), _entry(), version_files)
+    assert excinfo.value.__traceback__
+
+    # the third file was waiting for the pool, it is never read
+    assert list(submitted) == ["/eos/0.pdf", "/eos/1.pdf", "/eos/2.pdf"]
+    assert submitted["/eos/2.pdf"].cancelled()
+    assert spooled == ["/eos/0.pdf", "/eos/1.pdf"]
+    assert service.draft_files.commit_file.call_count == 1
+
+
+def _staged_load(tmp_path, mocker, contents):
+    """Load of staged files, the staged copies having the given contents."""
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        migration_logger=mocker.Mock(),
+    )
+    load.files_staging = mocker.Mock()
+    load.files_staging.open.side_effect = lambda source: BytesIO(contents[source])
+    return load
+
+
+def test_load_files_checksum(app, tmp_path, mocker):
+    """Test the files are committed when their checksum matches the legacy one."""
+    service = _service(mocker)
+    service.draft_files.commit_file.return_value.to_dict.return_value = {
+        "file_id": "file-0",
+        "size": 10,
+    }
+    load = _staged_load(tmp_path, mocker, {"/eos/0.pdf": b"content 0"})
+    version_files = _version_files(1)
+    version_files["0.pdf"]["checksum"] = hashlib.md5(b"content 0").hexdigest()
+
+    load._load_files(mocker.Mock(id="abcd-1234"), _entry(), version_files)
+
+    service.draft_files.commit_file.assert_called_once()
+    load.files_staging.release.assert_called_once_with("/eos/0.pdf")
+    assert load._loaded_files["abcd-1234"] == [
+        {"legacy_file_id": 0, "file_key": "0.pdf", "file_id": "file-0", "size": "10"}
+    ]
+
+
+def test_load_files_checksum_mismatch(app, tmp_path, mocker):
+    """Test a file is not committed when its checksum differs from the legacy one."""
+    service = _service(mocker)
+    load = _staged_load(tmp_path, mocker, {"/eos/0.pdf": b"corrupted"})
+    version_files = _version_files(1)
+    version_files["0.pdf"]["checksum"] = hashlib.md5(b"content 0").hexdigest()
+
+    with pytest.raises(ManualImportRequired) as excinfo:
+        load._load_files(mocker.Mock(id="abcd-1234"), _entry(), version_files)
+
+    assert excinfo.value.field == "checksum"
+    service.draft_files.set_file_content.assert_called_once()
+    service.draft_files.commit_file.assert_not_called()
+    # released all the same, the staged copy is not loaded again
+    load.files_staging.release.assert_called_once_with("/eos/0.pdf")
+    load.migration_logger.add_log.assert_called_once()
+    assert "abcd-1234" not in load._loaded_files
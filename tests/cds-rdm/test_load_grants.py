@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the access grants load."""
+
+from cds_migrator_kit.rdm.records.load.load import CDSRecordServiceLoad
+
+
+def _entry(recid, *grants):
+    """Transformed entry of a record with the given access grants."""
+    return {"record": {"recid": recid, "json": {"access_grants": list(grants)}}}
+
+
+def test_load_grants_validated_once(app, tmp_path, mocker):
+    """Test the grants and their subjects are validated once per run."""
+    service = mocker.MagicMock()
+    service.access._validate_grant_subject.return_value = True
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.current_rdm_records_service", service
+    )
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.mint_legacy_redirects",
+        return_value=[],
+    )
+    users_lookup = mocker.Mock()
+    users_lookup.get_many.return_value = {}
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        users_lookup=users_lookup,
+    )
+
+    def load_grants(entry):
+        draft = mocker.Mock()
+        load._after_publish_load_parent_access_grants(draft, {}, entry)
+        return draft._record.parent.access.grants.create
+
+    grants = (
+        {"it-dep [CERN]": None},
+        {"hr-dep": "manage"},
+    )
+    load_grants(_entry("1", *grants))
+    create = load_grants(_entry("2", *grants, {"it-dep": "manage"}))
+
+    # created on each record, each grant validated once, each subject once
+    # whatever its permission
+    assert create.call_count == 2
+    schema_grants = [
+        call.args[0]["grants"][0]
+        for call in service.access.schema_grants.load.call_args_list
+    ]
+    assert sorted(
+        (grant["subject"]["id"], grant["permission"]) for grant in schema_grants
+    ) == [("hr-dep", "manage"), ("it-dep", "manage"), ("it-dep", "view")]
+    assert service.access._validate_grant_subject.call_count == 2
+
+    # validated again on the next run
+    load._cleanup()
+    load_grants(_entry("3", *grants))
+    assert service.access.schema_grants.load.call_count == 5
+    assert service.access._validate_grant_subject.call_count == 4
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the deferred indexing of the load."""
+
+from invenio_access.permissions import system_identity
+from invenio_rdm_records.proxies import current_rdm_records_service
+from invenio_rdm_records.records.api import RDMRecord
+
+from cds_migrator_kit.rdm.records.load.indexing import (
+    DeferredIndexing,
+    DeferredIndexingUnitOfWork,
+)
+
+
+def _total(recid):
+    """Number of indexed documents of a record."""
+    RDMRecord.index.refresh()
+    return current_rdm_records_service.search(system_identity, q=f"id:{recid}").total
+
+
+def test_deferred_indexing(
+    test_app, db, minimal_restricted_record, search, search_clear
+):
+    """Test the records are only indexed in bulk on flush."""
+    service = current_rdm_records_service
+    deferred_indexing = DeferredIndexing()
+    with DeferredIndexingUnitOfWork(deferred_indexing) as uow:
+        draft = service.create(system_identity, minimal_restricted_record, uow=uow)
+        uow.commit()
+    with DeferredIndexingUnitOfWork(deferred_indexing) as uow:
+        record = service.publish(system_identity, draft.id, uow=uow)
+        uow.commit()
+
+    assert _total(record.id) == 0
+
+    # the published draft, never indexed, is skipped
+    deferred_indexing.flush()
+    assert _total(record.id) == 1
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the batched commits of the load."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from invenio_accounts.models import User
+
+from cds_migrator_kit.rdm.records.load.transactions import (
+    BatchedCommits,
+    BatchedSession,
+)
+
+
+def _emails(db):
+    return {email for (email,) in db.session.query(User.email)}
+
+
+def test_batched_commits_savepoints(app, db):
+    """Test a failed record only rolls back its own savepoint."""
+    batched_commits = BatchedCommits(batch_size=3)
+    with batched_commits.record():
+        db.session.add(User(email="loaded@cern.ch", active=True))
+        # the commits of the load and of the services are not committing
+        db.session.commit()
+
+    session = db.session()
+    assert isinstance(session, BatchedSession)
+    with pytest.raises(ValueError):
+        with batched_commits.record():
+            db.session.add(User(email="failed@cern.ch", active=True))
+            db.session.commit()
+            raise ValueError()
+    assert _emails(db) == {"loaded@cern.ch"}
+
+    with batched_commits.record():
+        db.session.add(User(email="rolledback@cern.ch", active=True))
+        db.session.flush()
+        # rolls back the record, which goes on in a new savepoint
+        db.session.rollback()
+        db.session.add(User(email="retried@cern.ch", active=True))
+        db.session.commit()
+    assert _emails(db) == {"loaded@cern.ch", "retried@cern.ch"}
+    assert not batched_commits.is_due()
+
+    with batched_commits.record():
+        db.session.add(User(email="last@cern.ch", active=True))
+    # due, the failed record is not counted in the batch
+    assert batched_commits.is_due()
+    assert session.in_transaction()
+    batched_commits.commit()
+    assert not session.in_transaction()
+    assert not batched_commits.is_due()
+    assert _emails(db) == {"loaded@cern.ch", "retried@cern.ch", "last@cern.ch"}
+
+
+def test_batched_commits_scope(app, db):
+    """Test only the session of the load is batched."""
+    with BatchedCommits(batch_size=10).record():
+        assert isinstance(db.session(), BatchedSession)
+
+        def other_session():
+            with app.app_context():
+                return type(db.session())
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(other_session).result() is not BatchedSession
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the load of the new record versions."""
+
+import arrow
+import pytest
+
+from cds_migrator_kit.rdm.records.load.load import CDSRecordServiceLoad
+
+
+class _Record(dict):
+    """Record of a draft, committed in place."""
+
+    def commit(self):
+        """Count the commits of the record."""
+        self.commits = getattr(self, "commits", 0) + 1
+
+
+def _draft(mocker, id, metadata):
+    """Draft of the records service, holding the given metadata."""
+    draft = mocker.MagicMock()
+    draft.__getitem__.side_effect = {"id": id}.__getitem__
+    draft._record = _Record(metadata=metadata)
+    draft.to_dict.side_effect = lambda: {"id": id, "metadata": dict(metadata)}
+    return draft
+
+
+def _entry():
+    """Transformed entry of a record with two versions."""
+    access = {"access_obj": {"record": "public", "files": "public"}}
+    return {
+        "record": {"recid": "2051872"},
+        "versions": {
+            1: {
+                "files": {},
+                "publication_date": arrow.get("2015-09-11T08:44:15"),
+                "access": access,
+            },
+            2: {
+                "files": {},
+                "publication_date": arrow.get("2015-09-11T16:30:04"),
+                "access": access,
+            },
+        },
+    }
+
+
+@pytest.fixture()
+def service(mocker):
+    """Mock the records service, the new versions copying the previous metadata."""
+    service = mocker.MagicMock()
+    metadata = {"title": "CMS paper", "publication_date": "2015-09-11"}
+    service.new_version.side_effect = lambda identity, id: _draft(
+        mocker, "v2", {**metadata, "publication_date": None}
+    )
+    # the update loads the given metadata as is
+    service.update_draft.side_effect = lambda identity, id, data: _draft(
+        mocker, id, data["metadata"]
+    )
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.current_rdm_records_service", service
+    )
+    return service
+
+
+def _new_version(mocker, tmp_path, skip_version_update):
+    """Prepare the second version of the entry, from the first one."""
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        migration_logger=mocker.Mock(),
+        skip_version_update=skip_version_update,
+    )
+    mocker.patch.object(load, "_load_record_access")
+    mocker.patch.object(load, "_load_files")
+    draft = load._pre_publish(None, _entry(), 2, _draft(mocker, "v1", {}))
+    load._load_files.assert_called_once_with(draft, _entry(), {})
+    return load, draft
+
+
+def test_skip_version_update(app, tmp_path, mocker, service):
+    """Test the new version is not updated through the service."""
+    _, draft = _new_version(mocker, tmp_path, True)
+
+    service.new_version.assert_called_once_with(None, "v1")
+    service.update_draft.assert_not_called()
+    assert draft["id"] == "v2"
+    assert draft._record == {
+        "metadata": {"title": "CMS paper", "publication_date": "2015-09-11"}
+    }
+    assert draft._record.commits == 1
+
+
+def test_skip_version_update_compare(app, tmp_path, mocker, service):
+    """Test the compare mode loads the same versions as the service update."""
+    _, updated = _new_version(mocker, tmp_path, False)
+    update = service.update_draft.call_args
+    service.update_draft.reset_mock()
+    load, compared = _new_version(mocker, tmp_path, "compare")
+    _, skipped = _new_version(mocker, tmp_path, True)
+
+    # updated through the service all the same
+    assert service.update_draft.call_args == update
+    assert compared._record == updated._record
+    assert skipped._record == updated._record
+    load.migration_logger.add_information.assert_not_called()
+
+
+def test_skip_version_update_compare_differences(app, tmp_path, mocker, service):
+    """Test the compare mode logs the fields set by the service update only."""
+    service.update_draft.side_effect = lambda identity, id, data: _draft(
+        mocker, id, {**data["metadata"], "resource_type": {"id": "publication"}}
+    )
+    load, _ = _new_version(mocker, tmp_path, "compare")
+
+    load.migration_logger.add_information.assert_called_once_with(
+        "2051872",
+        {
+            "message": "Version 2 without the service update differs from the "
+            "updated one.",
+            "value": ["resource_type"],
+        },
+    )
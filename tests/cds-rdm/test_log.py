@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the migration loggers."""
+
+import pickle
+
+from cds_migrator_kit.errors import UnexpectedValue
+from cds_migrator_kit.reports.log import DeferredLogger
+
+
+class CallsLogger:
+    """Logger recording the calls made to it."""
+
+    def __init__(self, name, calls):
+        """Constructor."""
+        self.name = name
+        self.calls = calls
+
+    def __getattr__(self, method):
+        """Record a call of the method."""
+        return lambda *args, **kwargs: self.calls.append(
+            (self.name, method, args, kwargs)
+        )
+
+
+def test_deferred_logger_replay():
+    """Test the deferred calls are replayed in order on their loggers."""
+    events = []
+    migration_logger = DeferredLogger("migration_logger", events)
+    record_state_logger = DeferredLogger("record_state_logger", events)
+
+    record_state_logger.add_record({"legacy_recid": "1"})
+    migration_logger.add_information("1", {"message": "m", "value": "v"})
+    record_state_logger.add_record_state({"legacy_recid": "1"})
+    migration_logger.finalise_record("1")
+
+    # the events are sent between processes
+    events = pickle.loads(pickle.dumps(events))
+
+    calls = []
+    DeferredLogger.replay(
+        events,
+        {
+            "migration_logger": CallsLogger("migration_logger", calls),
+            "record_state_logger": CallsLogger("record_state_logger", calls),
+        },
+    )
+    assert calls == [
+        ("record_state_logger", "add_record", ({"legacy_recid": "1"},), {}),
+        (
+            "migration_logger",
+            "add_information",
+            ("1", {"message": "m", "value": "v"}),
+            {},
+        ),
+        ("record_state_logger", "add_record_state", ({"legacy_recid": "1"},), {}),
+        ("migration_logger", "finalise_record", ("1",), {}),
+    ]
+
+
+def test_deferred_logger_add_log():
+    """Test only the recid of the failed record is deferred."""
+    events = []
+    exc = UnexpectedValue(field="title", value="")
+    DeferredLogger("migration_logger", events).add_log(
+        exc, record={"record": {"recid": "2", "title": ""}}, key="245__"
+    )
+    assert events == [
+        (
+            "migration_logger",
+            "add_log",
+            (exc,),
+            {"record": {"recid": "2"}, "key": "245__", "value": None},
+        )
+    ]
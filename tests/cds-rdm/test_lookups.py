@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the migration lookups."""
+
+from invenio_accounts.models import User, UserIdentity
+from invenio_vocabularies.contrib.names.models import NamesMetadata
+
+from cds_migrator_kit.rdm.records.lookups import NamesLookup, chunked
+from cds_migrator_kit.users.lookups import UsersLookup
+
+
+def _create_name(session, email, identities, json):
+    """Create a user with its identities and its names entry."""
+    user = User(email=email, active=True)
+    session.add(user)
+    session.flush()
+    for person_id, method in identities:
+        session.add(UserIdentity(id=person_id, method=method, id_user=user.id))
+    name = NamesMetadata(json=json, internal_id=str(user.id))
+    session.add(name)
+    session.commit()
+    return str(name.id)
+
+
+def test_chunked():
+    """Test the splitting of the IN queries values."""
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_names_lookup_resolve(db):
+    """Test the resolution of the person ids to names entries."""
+    name_id = _create_name(
+        db.session,
+        "jdoe@cern.ch",
+        [("1001", "cern"), ("1002", "cern-legacy")],
+        {"name": "Doe, John"},
+    )
+    _create_name(
+        db.session,
+        "hidden@cern.ch",
+        [("1003", "cern")],
+        {"name": "Hidden", "tags": ["unlisted"]},
+    )
+
+    lookup = NamesLookup()
+    lookup.resolve(["1001", 1002, "1003", "1004"])
+    # the person ids of the same user share the entry
+    assert lookup.get("1001") is lookup.get(1002)
+    assert lookup.get("1001") == {"id": name_id, "json": {"name": "Doe, John"}}
+    # unlisted and unknown person ids are cached as not found
+    assert lookup.get("1003") is None
+    assert lookup.get("1004") is None
+    assert dict(lookup.items()).keys() == {"1001", "1002"}
+
+    warm_lookup = NamesLookup()
+    warm_lookup.warm()
+    assert warm_lookup.get("1002")["id"] == name_id
+    assert warm_lookup.get("1004") is None
+
+
+def test_names_lookup_flush(database):
+    """Test the merged identifiers are written apart from the session."""
+    name_id = _create_name(
+        database.session, "merged@cern.ch", [("2001", "cern")], {"name": "Doe, Jane"}
+    )
+    orcid = {"identifier": "0009-0007-7638-4652", "scheme": "orcid"}
+
+    lookup = NamesLookup()
+    lookup.merge_identifiers(lookup.get("2001")["id"], [orcid, orcid])
+    assert lookup.get("2001")["json"]["identifiers"] == [orcid]
+
+    # an uncommitted change of the load is neither committed nor rolled back
+    user = User.query.filter_by(email="merged@cern.ch").one()
+    user.active = False
+    lookup.flush()
+    database.session.rollback()
+
+    name = NamesMetadata.query.filter_by(id=name_id).one()
+    assert name.json["identifiers"] == [orcid]
+    assert name.version_id == 2
+    assert User.query.filter_by(email="merged@cern.ch").one().active
+
+    # nothing left to write
+    lookup.flush()
+    assert NamesMetadata.query.filter_by(id=name_id).one().version_id == 2
+
+
+def test_users_lookup(db, mocker):
+    """Test each email is queried at most once."""
+    user = User(email="submitter@cern.ch", active=True)
+    db.session.add(user)
+    db.session.commit()
+
+    lookup = UsersLookup()
+    fetch = mocker.spy(lookup, "_fetch")
+    assert lookup.get_many(["submitter@cern.ch", "unknown@cern.ch"]) == {
+        "submitter@cern.ch": user.id
+    }
+    assert lookup.get("submitter@cern.ch") == user.id
+    # unknown emails are cached as not found
+    assert lookup.get("unknown@cern.ch") is None
+    assert fetch.call_count == 1
+    assert dict(lookup.items()) == {"submitter@cern.ch": user.id}
+
+    warm_lookup = UsersLookup()
+    warm_lookup.warm()
+    assert warm_lookup.get("submitter@cern.ch") == user.id
+    assert warm_lookup.get("unknown@cern.ch") is None
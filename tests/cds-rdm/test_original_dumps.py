@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the original dumps store."""
+
+from pathlib import Path
+
+from cds_migrator_kit.rdm.records.dumps import OriginalDumpsStore
+
+
+def test_original_dumps_store(tmp_path):
+    """Test the dumps are stored once, by content."""
+    store = OriginalDumpsStore(tmp_path / "dumps")
+    dump = {"recid": 2742366, "record": [{"marcxml": "<record>é</record>"}]}
+    ref = store.put(dump)
+    assert Path(ref).is_absolute()
+    assert OriginalDumpsStore.get(ref) == dump
+
+    # the same content is stored once
+    assert store.put(dict(dump)) == ref
+    assert store.put({"recid": 2742367}) != ref
+    files = [path for path in (tmp_path / "dumps").rglob("*") if path.is_file()]
+    assert len(files) == 2
+    assert all(path.suffix == ".json" for path in files)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the overdo models."""
+
+import json
+from copy import deepcopy
+from os.path import join
+
+from cds_migrator_kit.rdm.records.transform.models.thesis import thesis_model
+from cds_migrator_kit.transform.dumper import CDSRecordDump
+from cds_migrator_kit.transform.overdo import copy_json
+
+
+def test_copy_json():
+    """Test the nested dicts and lists are copied."""
+    value = {"a": [{"b": 1}, "c"], "d": {"e": None}}
+    copy = copy_json(value)
+    assert copy == deepcopy(value)
+    assert copy["a"] is not value["a"]
+    assert copy["a"][0] is not value["a"][0]
+    assert copy["d"] is not value["d"]
+
+
+def test_models_default_fields(datadir):
+    """Test the rules extend a copy of the default fields of the model."""
+    default_fields = deepcopy(thesis_model._default_fields)
+    with open(join(datadir, "thesis/dump/test_records.json")) as fp:
+        entries = json.load(fp)
+
+    custom_fields = []
+    for entry in entries:
+        dump = CDSRecordDump(entry, dojson_model=thesis_model)
+        dump.prepare_revisions()
+        _, record = dump.latest_revision
+        custom_fields.append(record["custom_fields"])
+
+    assert thesis_model._default_fields == default_fields
+    assert custom_fields[0]["thesis:thesis"]["type"] == "PhD"
+    assert custom_fields[0] is not custom_fields[1]
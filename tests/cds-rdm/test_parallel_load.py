@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the parallel load."""
+
+import queue
+import threading
+import time
+import traceback
+from types import SimpleNamespace
+
+import pytest
+
+from cds_migrator_kit.rdm.records.load.load import (
+    CDSRecordServiceLoad,
+    load_partition,
+)
+
+
+def test_load_partition():
+    """Test the entries are partitioned by legacy recid."""
+    entries = [{"record": {"recid": str(recid)}} for recid in range(100)]
+    assert {load_partition(entry, 4) for entry in entries} == {0, 1, 2, 3}
+    # all the versions of a record go to the same partition
+    entry = {"record": {"recid": "2742366"}, "versions": {1: {}, 2: {}}}
+    assert load_partition(entry, 4) == load_partition(
+        {"record": {"recid": "2742366"}}, 4
+    )
+
+
+def test_parallel_load_setup(app, tmp_path):
+    """Test the records writers are only set up by the workers."""
+    options = dict(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        commit_batch_size=100,
+        defer_indexing=True,
+        legacy_records_batch_size=100,
+        files_staging_dir=str(tmp_path / "staging"),
+    )
+    load = CDSRecordServiceLoad(workers=2, **options)
+    assert load.files_staging is None
+    assert load.batched_commits is None
+    assert load.deferred_indexing is None
+    assert load.legacy_records_writer is None
+    assert load._worker_kwargs["commit_batch_size"] == 100
+    assert "workers" not in load._worker_kwargs
+
+    worker_load = CDSRecordServiceLoad(**load._worker_kwargs)
+    assert worker_load.files_staging is not None
+    assert worker_load.batched_commits is not None
+    assert worker_load.legacy_records_writer is not None
+
+
+class _WorkerThread(threading.Thread):
+    """Worker process run as a thread of the test."""
+
+    def __init__(self, target, args):
+        """Constructor."""
+        super().__init__(target=target, args=args, daemon=True)
+        self.terminated = threading.Event()
+
+    def terminate(self):
+        """Stop the worker."""
+        self.terminated.set()
+
+
+@pytest.fixture()
+def worker(mocker):
+    """Run the load workers as threads, loading the entries with ``load``."""
+    queues = []
+
+    def Queue(maxsize=0):
+        queues.append(queue.Queue(maxsize=maxsize))
+        return queues[-1]
+
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.multiprocessing.get_context",
+        return_value=SimpleNamespace(Queue=Queue, Process=_WorkerThread),
+    )
+    worker = SimpleNamespace(load=None, queues=queues)
+
+    def run_worker(load_kwargs, entries_queue, results_queue, log_queue, log_level):
+        thread = threading.current_thread()
+        try:
+            while not thread.terminated.is_set():
+                try:
+                    entry = entries_queue.get(timeout=0.01)
+                except queue.Empty:
+                    continue
+                if entry is None:
+                    results_queue.put(("done", []))
+                    return
+                results_queue.put(("loaded", worker.load(entry)))
+        except Exception:
+            results_queue.put(("error", traceback.format_exc()))
+
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.workers.run_worker", run_worker
+    )
+    return worker
+
+
+def _entries(count):
+    """Entries of the records to load."""
+    return [{"record": {"recid": str(recid)}} for recid in range(count)]
+
+
+def test_parallel_dry_run_in_flight(app, tmp_path, mocker, worker):
+    """Test the dry run reads the entries no faster than they are validated."""
+    validated = []
+
+    def load(entry):
+        time.sleep(0.005)
+        validated.append(entry["record"]["recid"])
+        return []
+
+    worker.load = load
+    in_flight = []
+
+    def entries():
+        for entry in _entries(50):
+            in_flight.append(len(in_flight) - len(validated))
+            yield entry
+
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        dry_run=True,
+        workers=2,
+        migration_logger=mocker.Mock(),
+        record_state_logger=mocker.Mock(),
+    )
+    load._parallel_load(entries())
+
+    assert sorted(validated, key=int) == [str(recid) for recid in range(50)]
+    # one shared queue of 4 entries per worker, besides the logs and results
+    assert [q.maxsize for q in worker.queues if q.maxsize] == [8]
+    # queued, being validated by each worker, or read from the dump
+    assert max(in_flight) <= 8 + 2 + 1
+
+
+def test_parallel_load_failures(app, tmp_path, mocker, worker):
+    """Test the logs of the workers are replayed, and their errors raised."""
+
+    def load(entry):
+        recid = entry["record"]["recid"]
+        if recid == "7":
+            # once the previous records are loaded
+            time.sleep(0.1)
+            raise ValueError("database is gone")
+        # a record failing to load, logged by the worker
+        return [("migration_logger", "add_log", (f"failed {recid}",), {})]
+
+    worker.load = load
+    migration_logger = mocker.Mock()
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        dry_run=True,
+        workers=2,
+        migration_logger=migration_logger,
+        record_state_logger=mocker.Mock(),
+    )
+
+    # raised to the runner, adding it to the migration log
+    with pytest.raises(RuntimeError) as excinfo:
+        load._parallel_load(iter(_entries(100)))
+
+    assert "Load worker failed" in str(excinfo.value)
+    assert "ValueError: database is gone" in str(excinfo.value)
+    logged = [call.args[0] for call in migration_logger.add_log.call_args_list]
+    assert "failed 0" in logged
+    assert "failed 7" not in logged
+
+
+def test_parallel_load_worker_exited(app, tmp_path, mocker, worker):
+    """Test a worker exiting without loading its entries fails the load."""
+    worker.load = None
+    mocker.patch(
+        "cds_migrator_kit.rdm.records.load.load.workers.run_worker",
+        lambda *args: None,
+    )
+    load = CDSRecordServiceLoad(
+        db_uri=None,
+        data_dir=str(tmp_path),
+        tmp_dir=str(tmp_path),
+        dry_run=True,
+        workers=1,
+        migration_logger=mocker.Mock(),
+        record_state_logger=mocker.Mock(),
+    )
+
+    with pytest.raises(RuntimeError, match="Load worker exited unexpectedly."):
+        load._parallel_load(iter(_entries(10)))
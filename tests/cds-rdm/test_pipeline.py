@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the pipelined migration stream."""
+
+import itertools
+import threading
+
+import pytest
+
+from cds_migrator_kit.runner.pipeline import PipelinedStream
+
+
+class ThreadsLogger:
+    """Migration logger recording the threads writing to it."""
+
+    def __init__(self):
+        """Constructor."""
+        self.calls = []
+
+    def add_information(self, recid, state):
+        """Record a call."""
+        self.calls.append((threading.current_thread().name, recid))
+
+
+class Extract:
+    """Extract of the legacy recids, endless if no count is given."""
+
+    def __init__(self, count=None):
+        """Constructor."""
+        self.count = count
+        self.closed = threading.Event()
+
+    def run(self):
+        """Yield the entries."""
+        try:
+            yield from itertools.islice(itertools.count(1), self.count)
+        finally:
+            self.closed.set()
+
+
+class Transform:
+    """Transform logging each entry, and failing on the ``fail`` one."""
+
+    def __init__(self, fail=None):
+        """Constructor."""
+        self.fail = fail
+        self.migration_logger = ThreadsLogger()
+
+    def run(self, entries):
+        """Transform the entries."""
+        for entry in entries:
+            if entry == self.fail:
+                raise ValueError(entry)
+            self.migration_logger.add_information(str(entry), {})
+            yield entry
+
+
+class Load:
+    """Load collecting the entries, and failing on the ``fail`` one."""
+
+    def __init__(self, fail=None):
+        """Constructor."""
+        self.fail = fail
+        self.entries = []
+
+    def run(self, entries, cleanup=False):
+        """Load the entries."""
+        for entry in entries:
+            if entry == self.fail:
+                raise RuntimeError(entry)
+            self.entries.append(entry)
+
+
+def test_pipelined_stream_logs(app):
+    """Test the logs of the transform are written by the load thread."""
+    transform = Transform()
+    logger = transform.migration_logger
+    load = Load()
+    PipelinedStream("test", Extract(count=5), transform, load, queue_size=2).run()
+    assert load.entries == [1, 2, 3, 4, 5]
+    main_thread = threading.current_thread().name
+    assert logger.calls == [(main_thread, str(recid)) for recid in range(1, 6)]
+    # the loggers of the transform are restored
+    assert transform.migration_logger is logger
+
+
+def test_pipelined_stream_load_failure(app):
+    """Test the transform is stopped when the load fails."""
+    extract = Extract()
+    stream = PipelinedStream("test", extract, Transform(), Load(fail=3), queue_size=2)
+    with pytest.raises(RuntimeError):
+        stream.run()
+    # closed in the transform thread, which is done
+    assert extract.closed.is_set()
+    assert not any(t.name == "test-transform" for t in threading.enumerate())
+
+
+def test_pipelined_stream_transform_failure(app):
+    """Test the load fails when the transform does."""
+    load = Load()
+    stream = PipelinedStream("test", Extract(), Transform(fail=3), load)
+    with pytest.raises(ValueError):
+        stream.run()
+    # the entries transformed before are loaded
+    assert load.entries == [1, 2]
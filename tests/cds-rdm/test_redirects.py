@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the legacy redirections."""
+
+import uuid
+
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+
+from cds_migrator_kit.rdm.records.load import redirects
+from cds_migrator_kit.rdm.records.load.redirects import mint_legacy_redirects
+
+
+def _lrecid(legacy_recid, object_uuid, status=PIDStatus.REGISTERED):
+    """Create a legacy recid PID."""
+    return PersistentIdentifier.create(
+        "lrecid",
+        legacy_recid,
+        object_type="rec",
+        object_uuid=object_uuid,
+        status=status,
+    )
+
+
+def test_mint_legacy_redirects(database, mocker):
+    """Test a failing chunk is minted again one redirection at a time."""
+    parent_uuid = uuid.uuid4()
+    _lrecid("1", parent_uuid)
+    _lrecid("2", uuid.uuid4(), status=PIDStatus.NEW)
+    _lrecid("10", parent_uuid)
+    database.session.commit()
+
+    lrecid_pids = redirects._lrecid_pids
+
+    def minted_meanwhile(legacy_recids, chunk_size):
+        """Mint a source by another process, once the sources are resolved."""
+        pids = lrecid_pids(legacy_recids, chunk_size)
+        if "12" in legacy_recids:
+            _lrecid("12", parent_uuid)
+            database.session.commit()
+        return pids
+
+    mocker.patch.object(redirects, "_lrecid_pids", side_effect=minted_meanwhile)
+    results = {
+        src: (dest, exc)
+        for src, dest, exc in mint_legacy_redirects(
+            {"10": "1", "11": "1", 12: 1, "13": "2", "14": "99"}, chunk_size=10
+        )
+    }
+    # the already minted redirections are skipped
+    assert results.keys() == {"11", "12", "13", "14"}
+    assert results["11"] == ("1", None)
+    assert results["12"][1] is not None
+    assert "not registered" in str(results["13"][1])
+    assert "not migrated" in str(results["14"][1])
+
+    pid = PersistentIdentifier.get("lrecid", "11")
+    assert pid.object_uuid == parent_uuid
+    assert pid.status == PIDStatus.REGISTERED
+    assert not PersistentIdentifier.query.filter_by(
+        pid_type="lrecid", pid_value="13"
+    ).count()
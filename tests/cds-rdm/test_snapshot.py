@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the lookups snapshot."""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from invenio_accounts.models import User, UserIdentity
+from invenio_vocabularies.contrib.names.models import NamesMetadata
+from invenio_vocabularies.records.api import Vocabulary
+
+from cds_migrator_kit.rdm.records.lookups import NamesLookup, VocabulariesLookup
+from cds_migrator_kit.rdm.records.snapshot import (
+    SNAPSHOT_VERSION,
+    LookupsSnapshot,
+    export_snapshot,
+)
+from cds_migrator_kit.users.lookups import UsersLookup
+
+
+def test_lookups_snapshot_round_trip(running_app, db, add_pid, tmp_path):
+    """Test the lookups read back from an exported snapshot."""
+    user = User(email="jdoe@cern.ch", active=True)
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(UserIdentity(id="1001", method="cern", id_user=user.id))
+    name = NamesMetadata(json={"name": "Doe, John"}, internal_id=str(user.id))
+    db.session.add(name)
+    db.session.commit()
+    add_pid("lrecid", "12345", uuid.uuid4())
+    Vocabulary.index.refresh()
+
+    filepath = tmp_path / "snapshot.db"
+    export_snapshot(filepath, vocabulary_types=["experiments"])
+    snapshot = LookupsSnapshot(filepath)
+    assert snapshot.version == str(SNAPSHOT_VERSION)
+
+    assert snapshot.users() == {"jdoe@cern.ch": user.id}
+    assert snapshot.users(["jdoe@cern.ch", "unknown@cern.ch"]) == {
+        "jdoe@cern.ch": user.id
+    }
+    assert snapshot.names(["1001", "1002"]) == {
+        "1001": (str(name.id), {"name": "Doe, John"})
+    }
+    assert snapshot.legacy_recid_status(12345) == "R"
+    assert snapshot.legacy_recid_status("404") is None
+    # the ids and titles are matched regardless of case and spaces
+    assert snapshot.search_vocabulary(" cms ", "experiments") == {
+        "hits": {"total": 1, "hits": [{"id": "CMS"}]}
+    }
+    assert snapshot.search_vocabulary("ATLAS", "experiments")["hits"]["total"] == 0
+
+    # the lookups of the transform read the snapshot instead of the database
+    assert UsersLookup(snapshot=snapshot).get("jdoe@cern.ch") == user.id
+    names = NamesLookup(snapshot=snapshot)
+    assert names.get("1001")["id"] == str(name.id)
+    names.merge_identifiers(str(name.id), [{"identifier": "1", "scheme": "lcds"}])
+    names.flush()
+    assert snapshot.names(["1001"])["1001"][1] == {"name": "Doe, John"}
+    vocabularies = VocabulariesLookup(snapshot=snapshot)
+    assert vocabularies.search("LHCB", "experiments")["hits"]["total"] == 1
+
+    # the pipelined transform reads it from another thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        users = executor.submit(snapshot.users, ["jdoe@cern.ch"]).result()
+    assert users == {"jdoe@cern.ch": user.id}
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the transform results cache."""
+
+from collections import namedtuple
+
+from cds_migrator_kit.rdm.records.transform.cache import TransformResultCache
+
+Snapshot = namedtuple("Snapshot", ["version", "created"])
+
+
+def test_transform_result_cache(tmp_path):
+    """Test the results are cached by entry, snapshot and options."""
+    snapshot = Snapshot("1", "2025-01-01T00:00:00")
+    cache = TransformResultCache(tmp_path, snapshot, {"collection": "thesis"})
+    entry = {"recid": "1", "record": [{"marcxml": "<record/>"}]}
+
+    key = cache.key(entry)
+    assert cache.key({"record": entry["record"], "recid": "1"}) == key
+    assert cache.key({**entry, "recid": "2"}) != key
+    assert cache.get(key) is None
+
+    events = [("migration_logger", "finalise_record", ("1",), {})]
+    cache.set(key, {"recid": "1"}, events)
+    assert cache.get(key) == ({"recid": "1"}, events)
+    # the failed and skipped entries are cached too
+    cache.set(cache.key({**entry, "recid": "2"}), None, [])
+    assert cache.get(cache.key({**entry, "recid": "2"})) == (None, [])
+    assert not list(tmp_path.rglob("*.tmp"))
+
+    # shared by the runs with the same snapshot and options
+    same = TransformResultCache(tmp_path, snapshot, {"collection": "thesis"})
+    assert same.get(same.key(entry)) == ({"recid": "1"}, events)
+    # missed after a new snapshot or with other options
+    other_snapshot = Snapshot("1", "2025-02-01T00:00:00")
+    other = TransformResultCache(tmp_path, other_snapshot, {"collection": "thesis"})
+    assert other.get(other.key(entry)) is None
+    other = TransformResultCache(tmp_path, snapshot, {"collection": "hr"})
+    assert other.get(other.key(entry)) is None
+
+
+def test_transform_result_cache_corrupted(tmp_path):
+    """Test a truncated cache entry is a cache miss."""
+    snapshot = Snapshot("1", "2025-01-01T00:00:00")
+    cache = TransformResultCache(tmp_path, snapshot, {})
+    key = cache.key({"recid": "1"})
+    cache.set(key, {"recid": "1"}, [])
+    path = next(tmp_path.rglob("*.pickle"))
+    path.write_bytes(path.read_bytes()[:10])
+    assert cache.get(key) is None
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests of the record versions built by the transform."""
+
+import json
+from copy import deepcopy
+from os.path import join
+from pathlib import Path
+
+import arrow
+
+from cds_migrator_kit.rdm.records.transform.transform import CDSToRDMRecordTransform
+from cds_migrator_kit.reports.log import DeferredLogger
+
+
+def _file(version):
+    """File entry of a version of the legacy record 2051872."""
+    return {
+        "eos_tmp_path": Path(
+            f"/eos/media/cds/files/g114/1141892/content.pdf;{version}"
+        ),
+        "id_bibdoc": 1141892,
+        "key": "cmspaper.pdf",
+        "metadata": {"description": None, "name": "cmspaper", "status": ""},
+        "mimetype": "application/pdf",
+        "checksum": "2942bfabb3d05332b66eb128e0842cff",
+        "version": version,
+        "access": "",
+        "type": "Main",
+        "creation_date": "2015-09-11",
+    }
+
+
+def test_versions(app, datadir):
+    """Test the versions are the same as built by the files loop before."""
+    with open(join(datadir, "sspn/dumps/test_records.json")) as fp:
+        entry = next(e for e in json.load(fp) if e["recid"] == 2051872)
+    original = deepcopy(entry)
+    events = []
+    transform = CDSToRDMRecordTransform(
+        files_dump_dir="/eos/media/cds/files",
+        missing_users=join(datadir, "users"),
+        migration_logger=DeferredLogger("migration_logger", events),
+    )
+    record = {"access": "public", "json": {"metadata": {"publication_date": "2015"}}}
+
+    versions = transform._versions(entry, record)
+
+    # output of the implementation before the single pass, the versions share
+    # the files accumulated over all the versions
+    access = {"access_obj": {"record": "public", "files": "public"}}
+    assert list(versions) == [1, 2]
+    assert versions == {
+        1: {
+            "files": {"cmspaper.pdf": _file(2)},
+            "publication_date": arrow.get("2015-09-11T08:44:15"),
+            "access": access,
+        },
+        2: {
+            "files": {"cmspaper.pdf": _file(2)},
+            "publication_date": arrow.get("2015-09-11T16:30:04"),
+            "access": access,
+        },
+    }
+    message = {"message": "File subformat pdfa dropped.", "value": "cmspaper.pdf"}
+    log = ("migration_logger", "add_information", ("2051872", message), {})
+    # once for each version
+    assert events == [log, log]
+    # the legacy entry is left untouched
+    assert entry == original